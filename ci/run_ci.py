@@ -1,36 +1,134 @@
 from __future__ import annotations
 
+import json
 import os
+import queue
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional
 
 ROOT = Path(__file__).resolve().parents[1]
+DAISY_CLI = [sys.executable, "tools/cli/daisy.py"]
+
+
+class _DaisyWorker:
+    """A long-lived `daisy.py --server` process that runs subcommands without a fresh interpreter each time."""
+
+    def __init__(self, env: Dict[str, str]) -> None:
+        self.proc = subprocess.Popen(
+            [*DAISY_CLI, "--server"],
+            cwd=str(ROOT),
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+
+    def request(self, payload: dict) -> int:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        try:
+            self.proc.stdin.write((json.dumps(payload) + "\n").encode("utf-8"))
+            line = self.proc.stdout.readline()
+        except OSError:
+            return 1
+        if not line:
+            return 1
+        try:
+            code = json.loads(line).get("code", 1)
+        except (json.JSONDecodeError, AttributeError):
+            return 1
+        return code if isinstance(code, int) else 1
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+
+class _DaisyWorkerPool:
+    """Hands each concurrent daisy subcommand an idle worker, starting new ones as stages fan out."""
+
+    def __init__(self, env: Dict[str, str], first: _DaisyWorker) -> None:
+        self.env = env
+        self.idle: "queue.SimpleQueue[_DaisyWorker]" = queue.SimpleQueue()
+        self.workers = [first]
+        self.lock = threading.Lock()
+        self.idle.put(first)
+
+    @classmethod
+    def start(cls, env: Dict[str, str]) -> Optional["_DaisyWorkerPool"]:
+        try:
+            worker = _DaisyWorker(env)
+        except OSError:
+            return None
+        if worker.request({"ping": True}) != 0:
+            worker.close()
+            return None
+        return cls(env, worker)
+
+    def run(self, argv: List[str]) -> int:
+        try:
+            worker = self.idle.get_nowait()
+        except queue.Empty:
+            worker = _DaisyWorker(self.env)
+            with self.lock:
+                self.workers.append(worker)
+        code = worker.request({"argv": argv})
+        if worker.alive():
+            self.idle.put(worker)
+        return code
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.close()
 
 
 def main() -> int:
     env = dict(os.environ)
     env.setdefault("DAISY_SANITIZE", "address")
-    commands = [
-        [sys.executable, "tools/cli/daisy.py", "build", "examples/english_hello.dsy"],
-        [sys.executable, "tools/cli/daisy.py", "build", "examples/korean_hello.dsy"],
-        [sys.executable, "tools/cli/daisy.py", "build", "examples/tensor_matmul.dsy"],
-        [sys.executable, "tools/cli/daisy.py", "build", "examples/concurrency.dsy"],
-        [sys.executable, "tools/cli/daisy.py", "test"],
-        [sys.executable, "tools/security/audit.py"],
-        [sys.executable, "tools/security/supply_chain_audit.py"],
-        [sys.executable, "tests/security/run_security_tests.py"],
-        [sys.executable, "tests/fuzz_lexer.py"],
-        [sys.executable, "tests/fuzz_compile.py"],
-        [sys.executable, "tests/fuzz_irgen.py"],
-        [sys.executable, "tools/cli/daisy.py", "test", "--long"],
-        [sys.executable, "tools/cli/daisy.py", "build-stage1"],
+    daisy = DAISY_CLI
+    # Commands within a stage are independent; stages run in order. The
+    # example builds all write generated C, objects and caches into
+    # ROOT/build, so each gets a stage of its own.
+    stages = [
+        [[*daisy, "build", "examples/english_hello.dsy"]],
+        [[*daisy, "build", "examples/korean_hello.dsy"]],
+        [[*daisy, "build", "examples/tensor_matmul.dsy"]],
+        [[*daisy, "build", "examples/concurrency.dsy"]],
+        [
+            [*daisy, "test"],
+            [sys.executable, "tools/security/audit.py"],
+            [sys.executable, "tools/security/supply_chain_audit.py"],
+            [sys.executable, "tests/security/run_security_tests.py"],
+        ],
+        [
+            [sys.executable, "tests/fuzz_lexer.py"],
+            [sys.executable, "tests/fuzz_compile.py"],
+            [sys.executable, "tests/fuzz_irgen.py"],
+        ],
+        [
+            [*daisy, "test", "--long"],
+        ],
+        [
+            [*daisy, "build-stage1"],
+        ],
     ]
-    for cmd in commands:
-        code = subprocess.call(cmd, cwd=str(ROOT), env=env)
-        if code != 0:
-            return code
+    workers = _DaisyWorkerPool.start(env)
+    try:
+        for stage in stages:
+            code = _run_stage(stage, env, workers)
+            if code != 0:
+                return code
+    finally:
+        if workers is not None:
+            workers.close()
     cargo = shutil.which("cargo")
     if cargo:
         rust_cmds = [
@@ -46,6 +144,21 @@ def main() -> int:
     return 0
 
 
+def _run_stage(stage: List[List[str]], env: Dict[str, str], workers: Optional[_DaisyWorkerPool] = None) -> int:
+    def run(cmd: List[str]) -> int:
+        if workers is not None and cmd[: len(DAISY_CLI)] == DAISY_CLI:
+            return workers.run(cmd[len(DAISY_CLI) :])
+        return subprocess.call(cmd, cwd=str(ROOT), env=env)
+
+    max_workers = max(1, min(len(stage), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        codes = list(pool.map(run, stage))
+    for code in codes:
+        if code != 0:
+            return code
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
 
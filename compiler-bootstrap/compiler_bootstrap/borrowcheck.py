@@ -1,57 +1,183 @@
 from __future__ import annotations
 
+import bisect
+from collections import ChainMap, deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import AbstractSet, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from compiler_core import ast, diagnostics, types
 from compiler_bootstrap.region_infer import RegionInfer
 
 
-@dataclass
+# Statements the borrow checker has nothing to do for.
+_SKIP_STMT_TYPES = frozenset(
+    {
+        ast.ExternFunctionDef,
+        ast.TraitDef,
+        ast.ImplDef,
+        ast.Import,
+        ast.Break,
+        ast.Continue,
+    }
+)
+
+# Shared empty uses/defs for CFG nodes that have none; never mutated.
+_NO_NAMES: FrozenSet[str] = frozenset()
+
+# Statements whose handlers never write local_vars, here or in a nested body.
+_READ_ONLY_STMT_TYPES = frozenset({ast.Print, ast.Return, ast.AddAssign, ast.Release})
+
+# Entry kinds in BorrowChecker._linear_stmts.
+_STMT, _HEADER, _ENTER_SCOPE, _EXIT_SCOPE, _PUSH_UNSAFE, _POP_UNSAFE = range(6)
+
+# Expressions whose only sub-expression is .value.
+_OPERAND_EXPR_TYPES = frozenset({ast.BorrowExpr, ast.CopyExpr, ast.MemberAccess, ast.UnaryOp})
+
+_BUILTIN_TYPES: Dict[str, types.Type] = {
+    "int": types.INT,
+    "정수": types.INT,
+    "bool": types.BOOL,
+    "불리언": types.BOOL,
+    "string": types.STRING,
+    "문자열": types.STRING,
+    "buffer": types.BUFFER,
+    "버퍼": types.BUFFER,
+    "view": types.VIEW,
+    "뷰": types.VIEW,
+    "tensor": types.TENSOR,
+    "텐서": types.TENSOR,
+    "channel": types.CHANNEL,
+    "채널": types.CHANNEL,
+    "unit": types.UNIT,
+    "void": types.UNIT,
+    "없음": types.UNIT,
+}
+
+
+@dataclass(slots=True)
 class BorrowInfo:
     owner: str
     mutable: bool
     var_name: str
 
 
+# Names visible in a CFG block: its own additions plus its parents'.
+class _Scope:
+    __slots__ = ("parent", "added")
+
+    def __init__(self, parent: Optional["_Scope"] = None) -> None:
+        self.parent = parent
+        self.added: Set[str] = set()
+
+    def __contains__(self, name: object) -> bool:
+        scope: Optional[_Scope] = self
+        while scope is not None:
+            if name in scope.added:
+                return True
+            scope = scope.parent
+        return False
+
+    def add(self, name: str) -> None:
+        self.added.add(name)
+
+
 class BorrowChecker:
     def __init__(self, type_info: "TypeInfo") -> None:
         self.errors: List[diagnostics.Diagnostic] = []
         self.type_info = type_info
         self.active_borrows: Dict[str, List[BorrowInfo]] = {}
-        self.scope_stack: List[List[BorrowInfo]] = []
-        self.moved: Dict[str, bool] = {}
-        self.moved_at: Dict[str, diagnostics.Span] = {}
+        # Borrows registered in open scopes, flat; each mark is where a scope starts.
+        self.scope_borrows: List[BorrowInfo] = []
+        self.scope_marks: List[int] = []
+        # Moved variables are a bitmask over var_id; moved_at is keyed by the same ids.
+        self.moved = 0
+        self.moved_at: Dict[int, diagnostics.Span] = {}
         self.unsafe_stack: List[bool] = []
         self.current_function: Optional[str] = None
         self.stmt_node: Dict[int, int] = {}
-        self.live_in: Dict[int, Set[str]] = {}
-        self.live_out: Dict[int, Set[str]] = {}
+        self.var_id: Dict[str, int] = {}
+        self.var_names: List[str] = []
+        self.live_in: List[int] = []
+        self.live_out: List[int] = []
+        self._linear_stmts: List[Tuple[int, Optional[ast.Stmt]]] = []
+        self._preds: List[List[int]] = []
         self.borrow_var_owner: Dict[str, str] = {}
-        self.borrow_var_mutable: Dict[str, bool] = {}
+        # Each owner's borrows, kept in borrow_var_owner's first-registration order.
+        self.borrows_by_owner: Dict[str, List[Tuple[str, bool]]] = {}
+        self.borrow_var_order: Dict[str, int] = {}
+        self.borrow_mask_for_owner: Dict[str, int] = {}
+        self._stmt_handlers: Dict[type, Callable[[ast.Stmt, Dict[str, types.Type]], None]] = {
+            ast.Assign: self._check_assign,
+            ast.AddAssign: self._check_add_assign,
+            ast.If: self._check_if,
+            ast.Repeat: self._check_repeat,
+            ast.While: self._check_while,
+            ast.Match: self._check_match,
+            ast.UnsafeBlock: self._check_unsafe,
+            ast.Print: self._check_print,
+            ast.Return: self._check_return,
+            ast.BufferCreate: self._check_buffer_create,
+            ast.BorrowSlice: self._check_borrow_slice,
+            ast.Move: self._check_move,
+            ast.Release: self._check_release,
+            ast.FunctionDef: self._check_nested_function,
+        }
+        self._expr_handlers: Dict[type, Callable[[ast.Expr, Dict[str, types.Type], bool], types.Type]] = {
+            ast.Name: self._check_name,
+            ast.BorrowExpr: self._check_borrow_expr,
+            ast.CopyExpr: self._check_copy_expr,
+            ast.MemberAccess: self._check_member_access,
+            ast.Call: self._check_call,
+            ast.IntLit: self._check_int_lit,
+            ast.StringLit: self._check_string_lit,
+            ast.BoolLit: self._check_bool_lit,
+            ast.BinOp: self._check_bin_op,
+            ast.UnaryOp: self._check_unary_op,
+            ast.LogicalOp: self._check_logical_op,
+            ast.TryExpr: self._check_try_expr,
+        }
+        self._stmt_use_handlers: Dict[type, Callable[[ast.Stmt, Set[str]], None]] = {
+            ast.Assign: self._uses_in_assign,
+            ast.AddAssign: self._uses_in_add_assign,
+            ast.Print: self._uses_in_print,
+            ast.Return: self._uses_in_return,
+            ast.While: self._uses_in_while,
+            ast.BufferCreate: self._uses_in_buffer_create,
+            ast.BorrowSlice: self._uses_in_borrow_slice,
+            ast.Move: self._uses_in_move,
+            ast.Release: self._uses_in_release,
+        }
+        self._stmt_def_handlers: Dict[type, Callable[[ast.Stmt], Set[str]]] = {
+            ast.Assign: self._defs_in_target,
+            ast.AddAssign: self._defs_in_target,
+            ast.BufferCreate: self._defs_in_named,
+            ast.BorrowSlice: self._defs_in_named,
+            ast.Move: self._defs_in_move,
+        }
 
     def check_module(self, module: ast.Module) -> None:
         for stmt in module.body:
+            if type(stmt) in _SKIP_STMT_TYPES:
+                continue
             if isinstance(stmt, ast.FunctionDef):
                 if stmt.type_params:
                     continue
                 self._check_function(stmt)
-            elif isinstance(stmt, ast.ExternFunctionDef):
-                continue
-            elif isinstance(stmt, ast.TraitDef):
-                continue
-            elif isinstance(stmt, ast.ImplDef):
-                continue
+            elif type(stmt) in _READ_ONLY_STMT_TYPES:
+                self._check_stmt(stmt, self.type_info.var_types)
             else:
-                self._check_stmt(stmt, self.type_info.var_types.copy())
+                # Writes land in the empty front map; var_types is never touched.
+                self._check_stmt(stmt, ChainMap({}, self.type_info.var_types))
 
     def _check_function(self, func: ast.FunctionDef) -> None:
         local_vars: Dict[str, types.Type] = {}
         for param in func.params:
             local_vars[param.name] = self._resolve_type(param.type_ref)
         self.active_borrows = {}
-        self.scope_stack = [[]]
-        self.moved = {}
+        self.scope_borrows = []
+        self.scope_marks = [0]
+        self.moved = 0
         self.moved_at = {}
         self.unsafe_stack = [False]
         self.current_function = func.name
@@ -59,179 +185,216 @@ class BorrowChecker:
         for err in region_info.errors:
             self.errors.append(self._diag(func, f"Region inference error: {err}"))
         self._analyze_cfg(func.body)
-        for stmt in func.body:
-            self._check_stmt(stmt, local_vars)
+        # A nested fn rebinds self._linear_stmts; this loop keeps its own list.
+        for kind, stmt in self._linear_stmts:
+            if kind == _STMT:
+                self._check_stmt(stmt, local_vars)
+            elif kind == _HEADER:
+                self._check_header(stmt, local_vars)
+            elif kind == _ENTER_SCOPE:
+                self._enter_scope()
+            elif kind == _EXIT_SCOPE:
+                self._exit_scope()
+            elif kind == _PUSH_UNSAFE:
+                self.unsafe_stack.append(True)
+            else:
+                self.unsafe_stack.pop()
         self.current_function = None
 
     def _check_stmt(self, stmt: ast.Stmt, local_vars: Dict[str, types.Type]) -> None:
+        if type(stmt) in _SKIP_STMT_TYPES:
+            return
         self._prune_dead_borrows(stmt)
-        if isinstance(stmt, ast.Assign):
-            if isinstance(stmt.target, ast.Name) and isinstance(stmt.value, ast.BorrowExpr):
-                owner_name = self._extract_name(stmt.value.value)
-                if owner_name:
-                    self._register_borrow(owner_name, stmt.value.mutable, stmt.target.value, stmt)
-            value_owner = self._check_expr(stmt.value, local_vars)
-            if isinstance(stmt.target, ast.Name):
-                local_vars[stmt.target.value] = value_owner
-                if stmt.target.value in self.moved:
-                    self.moved[stmt.target.value] = False
-            if isinstance(stmt.value, ast.Name):
-                self._move_if_needed(stmt.value.value, local_vars, stmt, stmt.value.span)
-        elif isinstance(stmt, ast.AddAssign):
-            self._check_expr(stmt.target, local_vars, allow_move=False)
-            self._check_expr(stmt.value, local_vars)
-        elif isinstance(stmt, ast.If):
-            self._check_expr(stmt.condition, local_vars)
-            self._enter_scope()
-            for inner in stmt.body:
-                self._check_stmt(inner, local_vars)
-            self._exit_scope()
-            if stmt.else_body:
-                self._enter_scope()
-                for inner in stmt.else_body:
-                    self._check_stmt(inner, local_vars)
-                self._exit_scope()
-        elif isinstance(stmt, ast.Repeat):
+        handler = self._stmt_handlers.get(type(stmt))
+        if handler is None:
+            handler = _lookup_handler(self._stmt_handlers, stmt)
+            if handler is None:
+                return
+        handler(stmt, local_vars)
+
+    def _check_header(self, stmt: ast.Stmt, local_vars: Dict[str, types.Type]) -> None:
+        self._prune_dead_borrows(stmt)
+        if isinstance(stmt, ast.Repeat):
             self._check_expr(stmt.count, local_vars)
-            self._enter_scope()
-            for inner in stmt.body:
-                self._check_stmt(inner, local_vars)
-            self._exit_scope()
-        elif isinstance(stmt, ast.While):
+        else:
             self._check_expr(stmt.condition, local_vars)
+
+    def _check_block(self, body: List[ast.Stmt], local_vars: Dict[str, types.Type]) -> None:
+        self._enter_scope()
+        for inner in body:
+            self._check_stmt(inner, local_vars)
+        self._exit_scope()
+
+    def _check_assign(self, stmt: ast.Assign, local_vars: Dict[str, types.Type]) -> None:
+        if isinstance(stmt.target, ast.Name) and isinstance(stmt.value, ast.BorrowExpr):
+            owner_name = self._extract_name(stmt.value.value)
+            if owner_name:
+                self._register_borrow(owner_name, stmt.value.mutable, stmt.target.value, stmt)
+        value_owner = self._check_expr(stmt.value, local_vars)
+        if isinstance(stmt.target, ast.Name):
+            local_vars[stmt.target.value] = value_owner
+            self.moved &= ~self._var_bit(stmt.target.value)
+        if isinstance(stmt.value, ast.Name):
+            self._move_if_needed(stmt.value.value, local_vars, stmt, stmt.value.span)
+
+    def _check_add_assign(self, stmt: ast.AddAssign, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.target, local_vars, allow_move=False)
+        self._check_expr(stmt.value, local_vars)
+
+    def _check_if(self, stmt: ast.If, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.condition, local_vars)
+        self._check_block(stmt.body, local_vars)
+        if stmt.else_body:
+            self._check_block(stmt.else_body, local_vars)
+
+    def _check_repeat(self, stmt: ast.Repeat, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.count, local_vars)
+        self._check_block(stmt.body, local_vars)
+
+    def _check_while(self, stmt: ast.While, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.condition, local_vars)
+        self._check_block(stmt.body, local_vars)
+
+    def _check_match(self, stmt: ast.Match, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.value, local_vars)
+        for case in stmt.cases:
             self._enter_scope()
-            for inner in stmt.body:
-                self._check_stmt(inner, local_vars)
-            self._exit_scope()
-        elif isinstance(stmt, ast.Match):
-            self._check_expr(stmt.value, local_vars)
-            for case in stmt.cases:
-                self._enter_scope()
-                if isinstance(case.pattern, ast.LiteralPattern):
-                    self._check_expr(case.pattern.value, local_vars)
-                elif isinstance(case.pattern, ast.EnumPattern):
-                    self._check_pattern_exprs(case.pattern, local_vars)
-                elif isinstance(case.pattern, ast.StructPattern):
-                    self._check_pattern_exprs(case.pattern, local_vars)
-                if case.guard:
-                    self._check_expr(case.guard, local_vars)
-                for inner in case.body:
-                    self._check_stmt(inner, local_vars)
-                self._exit_scope()
-            if stmt.else_body:
-                self._enter_scope()
-                for inner in stmt.else_body:
-                    self._check_stmt(inner, local_vars)
-                self._exit_scope()
-        elif isinstance(stmt, ast.UnsafeBlock):
-            self.unsafe_stack.append(True)
-            self._enter_scope()
-            for inner in stmt.body:
+            if isinstance(case.pattern, ast.LiteralPattern):
+                self._check_expr(case.pattern.value, local_vars)
+            elif isinstance(case.pattern, ast.EnumPattern):
+                self._check_pattern_exprs(case.pattern, local_vars)
+            elif isinstance(case.pattern, ast.StructPattern):
+                self._check_pattern_exprs(case.pattern, local_vars)
+            if case.guard:
+                self._check_expr(case.guard, local_vars)
+            for inner in case.body:
                 self._check_stmt(inner, local_vars)
             self._exit_scope()
-            self.unsafe_stack.pop()
-        elif isinstance(stmt, ast.Print):
+        if stmt.else_body:
+            self._check_block(stmt.else_body, local_vars)
+
+    def _check_unsafe(self, stmt: ast.UnsafeBlock, local_vars: Dict[str, types.Type]) -> None:
+        self.unsafe_stack.append(True)
+        self._check_block(stmt.body, local_vars)
+        self.unsafe_stack.pop()
+
+    def _check_print(self, stmt: ast.Print, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.value, local_vars)
+
+    def _check_return(self, stmt: ast.Return, local_vars: Dict[str, types.Type]) -> None:
+        if stmt.value:
             self._check_expr(stmt.value, local_vars)
-        elif isinstance(stmt, ast.Return):
-            if stmt.value:
-                self._check_expr(stmt.value, local_vars)
-        elif isinstance(stmt, ast.BufferCreate):
-            local_vars[stmt.name] = types.BUFFER
-        elif isinstance(stmt, ast.BorrowSlice):
-            self._check_expr(stmt.buffer, local_vars, allow_move=False)
-            owner_name = self._extract_name(stmt.buffer)
-            if owner_name:
-                self._register_borrow(owner_name, stmt.mutable, stmt.name, stmt)
-            local_vars[stmt.name] = types.VIEW
-        elif isinstance(stmt, ast.Move):
-            if isinstance(stmt.src, ast.Name):
-                self._move_if_needed(stmt.src.value, local_vars, stmt, stmt.src.span)
-            local_vars[stmt.dst] = self._type_of_expr(stmt.src, local_vars)
-        elif isinstance(stmt, ast.Release):
-            self._check_expr(stmt.target, local_vars, allow_move=False)
-            target_name = self._extract_name(stmt.target)
-            if target_name:
-                if self.active_borrows.get(target_name):
-                    if not self._borrows_expired(target_name, stmt):
-                        if not self._in_unsafe():
-                            self.errors.append(
-                                self._diag(
-                                    stmt,
-                                    f"Cannot release '{target_name}' while borrows are alive",
-                                )
+
+    def _check_buffer_create(self, stmt: ast.BufferCreate, local_vars: Dict[str, types.Type]) -> None:
+        local_vars[stmt.name] = types.BUFFER
+
+    def _check_borrow_slice(self, stmt: ast.BorrowSlice, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.buffer, local_vars, allow_move=False)
+        owner_name = self._extract_name(stmt.buffer)
+        if owner_name:
+            self._register_borrow(owner_name, stmt.mutable, stmt.name, stmt)
+        local_vars[stmt.name] = types.VIEW
+
+    def _check_move(self, stmt: ast.Move, local_vars: Dict[str, types.Type]) -> None:
+        if isinstance(stmt.src, ast.Name):
+            self._move_if_needed(stmt.src.value, local_vars, stmt, stmt.src.span)
+        local_vars[stmt.dst] = self._type_of_expr(stmt.src, local_vars)
+
+    def _check_release(self, stmt: ast.Release, local_vars: Dict[str, types.Type]) -> None:
+        self._check_expr(stmt.target, local_vars, allow_move=False)
+        target_name = self._extract_name(stmt.target)
+        if target_name:
+            if self.active_borrows.get(target_name):
+                if not self._borrows_expired(target_name, stmt):
+                    if not self._in_unsafe():
+                        self.errors.append(
+                            self._diag(
+                                stmt,
+                                f"Cannot release '{target_name}' while borrows are alive",
                             )
-                        self.active_borrows[target_name] = []
-                    else:
-                        self.active_borrows[target_name] = []
-        elif isinstance(stmt, ast.FunctionDef):
-            self._check_function(stmt)
-        elif isinstance(stmt, ast.ExternFunctionDef):
-            return
-        elif isinstance(stmt, ast.Import):
-            return
-        elif isinstance(stmt, ast.Break):
-            return
-        elif isinstance(stmt, ast.Continue):
-            return
+                        )
+                    self.active_borrows[target_name] = []
+                else:
+                    self.active_borrows[target_name] = []
+
+    def _check_nested_function(self, stmt: ast.FunctionDef, local_vars: Dict[str, types.Type]) -> None:
+        self._check_function(stmt)
 
     def _check_expr(self, expr: ast.Expr, local_vars: Dict[str, types.Type], allow_move: bool = True) -> types.Type:
-        if isinstance(expr, ast.Name):
-            if self.moved.get(expr.value, False):
-                moved_span = self.moved_at.get(expr.value)
-                if moved_span:
-                    msg = f"Use after move: {expr.value} (moved at L{moved_span.line_start}:{moved_span.column_start})"
-                else:
-                    msg = f"Use after move: {expr.value}"
-                if not self._in_unsafe():
-                    self.errors.append(self._diag(expr, msg))
-            t = local_vars.get(expr.value, types.UNIT)
-            return t
-        if isinstance(expr, ast.BorrowExpr):
-            owner_name = self._extract_name(expr.value)
-            self._check_expr(expr.value, local_vars, allow_move=False)
-            return self.type_info.expr_types.get(id(expr), types.VIEW)
-        if isinstance(expr, ast.CopyExpr):
-            self._check_expr(expr.value, local_vars, allow_move=False)
-            return self.type_info.expr_types.get(id(expr), types.UNIT)
-        if isinstance(expr, ast.MemberAccess):
-            self._check_expr(expr.value, local_vars, allow_move=False)
-            return self.type_info.expr_types.get(id(expr), types.UNIT)
-        if isinstance(expr, ast.Call):
-            for arg in expr.args:
-                self._check_expr(arg, local_vars)
-            return self.type_info.expr_types.get(id(expr), types.UNIT)
-        if isinstance(expr, ast.IntLit):
-            return types.INT
-        if isinstance(expr, ast.StringLit):
-            return types.STRING
-        if isinstance(expr, ast.BoolLit):
-            return types.BOOL
-        if isinstance(expr, ast.BinOp):
-            self._check_expr(expr.left, local_vars)
-            self._check_expr(expr.right, local_vars)
-            left_type = self._type_of_expr(expr.left, local_vars)
-            right_type = self._type_of_expr(expr.right, local_vars)
-            if not left_type.is_copy or not right_type.is_copy:
-                if not self._in_unsafe():
-                    self.errors.append(
-                        self._diag(expr, "Arithmetic operands must be Copy types"),
-                    )
-            return self.type_info.expr_types.get(id(expr), types.UNIT)
-        if isinstance(expr, ast.UnaryOp):
-            self._check_expr(expr.value, local_vars)
-            value_type = self._type_of_expr(expr.value, local_vars)
-            if not value_type.is_copy:
+        handler = self._expr_handlers.get(type(expr))
+        if handler is None:
+            handler = _lookup_handler(self._expr_handlers, expr)
+            if handler is None:
+                return types.UNIT
+        return handler(expr, local_vars, allow_move)
+
+    def _check_name(self, expr: ast.Name, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        index = self.var_id.get(expr.value)
+        if index is not None and self.moved >> index & 1:
+            moved_span = self.moved_at.get(index)
+            if moved_span:
+                msg = f"Use after move: {expr.value} (moved at L{moved_span.line_start}:{moved_span.column_start})"
+            else:
+                msg = f"Use after move: {expr.value}"
+            if not self._in_unsafe():
+                self.errors.append(self._diag(expr, msg))
+        t = local_vars.get(expr.value, types.UNIT)
+        return t
+
+    def _check_borrow_expr(self, expr: ast.BorrowExpr, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        self._check_expr(expr.value, local_vars, allow_move=False)
+        return self.type_info.expr_types.get(id(expr), types.VIEW)
+
+    def _check_copy_expr(self, expr: ast.CopyExpr, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        self._check_expr(expr.value, local_vars, allow_move=False)
+        return self.type_info.expr_types.get(id(expr), types.UNIT)
+
+    def _check_member_access(self, expr: ast.MemberAccess, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        self._check_expr(expr.value, local_vars, allow_move=False)
+        return self.type_info.expr_types.get(id(expr), types.UNIT)
+
+    def _check_call(self, expr: ast.Call, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        for arg in expr.args:
+            self._check_expr(arg, local_vars)
+        return self.type_info.expr_types.get(id(expr), types.UNIT)
+
+    def _check_int_lit(self, expr: ast.IntLit, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        return types.INT
+
+    def _check_string_lit(self, expr: ast.StringLit, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        return types.STRING
+
+    def _check_bool_lit(self, expr: ast.BoolLit, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        return types.BOOL
+
+    def _check_bin_op(self, expr: ast.BinOp, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        self._check_expr(expr.left, local_vars)
+        self._check_expr(expr.right, local_vars)
+        left_type = self._type_of_expr(expr.left, local_vars)
+        right_type = self._type_of_expr(expr.right, local_vars)
+        if not left_type.is_copy or not right_type.is_copy:
+            if not self._in_unsafe():
                 self.errors.append(
-                    self._diag(expr, "Unary arithmetic requires Copy type"),
+                    self._diag(expr, "Arithmetic operands must be Copy types"),
                 )
-            return self.type_info.expr_types.get(id(expr), types.UNIT)
-        if isinstance(expr, ast.LogicalOp):
-            self._check_expr(expr.left, local_vars)
-            self._check_expr(expr.right, local_vars)
-            return self.type_info.expr_types.get(id(expr), types.UNIT)
-        if isinstance(expr, ast.TryExpr):
-            return self._check_expr(expr.value, local_vars)
-        return types.UNIT
+        return self.type_info.expr_types.get(id(expr), types.UNIT)
+
+    def _check_unary_op(self, expr: ast.UnaryOp, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        self._check_expr(expr.value, local_vars)
+        value_type = self._type_of_expr(expr.value, local_vars)
+        if not value_type.is_copy:
+            self.errors.append(
+                self._diag(expr, "Unary arithmetic requires Copy type"),
+            )
+        return self.type_info.expr_types.get(id(expr), types.UNIT)
+
+    def _check_logical_op(self, expr: ast.LogicalOp, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        self._check_expr(expr.left, local_vars)
+        self._check_expr(expr.right, local_vars)
+        return self.type_info.expr_types.get(id(expr), types.UNIT)
+
+    def _check_try_expr(self, expr: ast.TryExpr, local_vars: Dict[str, types.Type], allow_move: bool) -> types.Type:
+        return self._check_expr(expr.value, local_vars)
 
     def _check_pattern_exprs(self, pattern: ast.Pattern, local_vars: Dict[str, types.Type]) -> None:
         if isinstance(pattern, ast.LiteralPattern):
@@ -251,9 +414,9 @@ class BorrowChecker:
         node_id = self.stmt_node.get(id(stmt))
         if node_id is None:
             return False
-        live = self.live_out.get(node_id, set())
+        live = self.live_out[node_id]
         for info in self.active_borrows.get(owner, []):
-            if info.var_name in live:
+            if live & self._var_bit(info.var_name):
                 return False
         return True
 
@@ -261,40 +424,92 @@ class BorrowChecker:
         node_id = self.stmt_node.get(id(stmt))
         if node_id is None:
             return
-        live = self.live_in.get(node_id, set())
-        for owner, borrows in list(self.active_borrows.items()):
-            alive = [b for b in borrows if b.var_name in live]
-            if alive:
-                self.active_borrows[owner] = alive
-            else:
-                self.active_borrows[owner] = []
+        live = self.live_in[node_id]
+        var_bit = self._var_bit
+        active_borrows = self.active_borrows
+        # Only values are replaced, so iterating the dict directly is safe.
+        for owner, borrows in active_borrows.items():
+            if borrows:
+                active_borrows[owner] = [b for b in borrows if live & var_bit(b.var_name)]
 
     def _analyze_cfg(self, stmts: List[ast.Stmt]) -> None:
-        nodes, entry, exits = self._build_cfg(stmts)
-        self.stmt_node = {id(node.stmt): node.node_id for node in nodes if node.stmt is not None}
-        self.borrow_var_owner = self._collect_borrow_mapping(nodes)
-        self.live_in, self.live_out = self._compute_liveness(nodes)
-
-    @dataclass
-    class _CFGNode:
-        node_id: int
-        stmt: Optional[ast.Stmt]
-        uses: Set[str]
-        defs: Set[str]
-        succs: List[int]
-
-    def _build_cfg(self, stmts: List[ast.Stmt]) -> Tuple[List["_CFGNode"], Optional[int], List[int]]:
-        nodes: List[BorrowChecker._CFGNode] = []
-        next_id = 0
-
-        def new_node(stmt: Optional[ast.Stmt], uses: Set[str], defs: Set[str]) -> BorrowChecker._CFGNode:
-            nonlocal next_id
-            node = BorrowChecker._CFGNode(node_id=next_id, stmt=stmt, uses=uses, defs=defs, succs=[])
-            nodes.append(node)
-            next_id += 1
-            return node
-
-        def build_block(block: List[ast.Stmt], known_vars: Set[str], nested: bool) -> Tuple[Optional[int], List[int], Set[str]]:
+        self.var_id = {}
+        self.var_names = []
+        self.stmt_node = {}
+        self.borrow_var_owner = {}
+        self.borrows_by_owner = {}
+        self.borrow_var_order = {}
+        self.borrow_mask_for_owner = {}
+        # _build_cfg fills stmt_node and the borrow maps as it creates nodes.
+        cfg, entry, exits = self._build_cfg(stmts)
+        self._preds = [[] for _ in cfg.stmts]
+        for node_id, succs in enumerate(cfg.succs):
+            for succ in succs:
+                self._preds[succ].append(node_id)
+        self.live_in, self.live_out = self._compute_liveness(cfg)
+
+    def live_in_names(self, node_id: int) -> Set[str]:
+        return self._mask_names(self.live_in[node_id])
+
+    def _mask_names(self, mask: int) -> Set[str]:
+        names: Set[str] = set()
+        while mask:
+            low = mask & -mask
+            names.add(self.var_names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def _var_bit(self, name: str) -> int:
+        index = self.var_id.get(name)
+        if index is None:
+            return 0
+        return 1 << index
+
+    def _var_mask(self, names: Set[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= 1 << self._intern(name)
+        return mask
+
+    def _intern(self, name: str) -> int:
+        index = self.var_id.get(name)
+        if index is None:
+            index = len(self.var_names)
+            self.var_id[name] = index
+            self.var_names.append(name)
+        return index
+
+    @dataclass(slots=True)
+    class _CFG:
+        # Parallel per-node columns indexed by node id.
+        stmts: List[Optional[ast.Stmt]]
+        uses: List[int]
+        defs: List[int]
+        succs: List[List[int]]
+
+    def _build_cfg(self, stmts: List[ast.Stmt]) -> Tuple["_CFG", Optional[int], List[int]]:
+        cfg = BorrowChecker._CFG(stmts=[], uses=[], defs=[], succs=[])
+        succs = cfg.succs
+        # Checking order for _check_function, recorded alongside the CFG.
+        linear: List[Tuple[int, Optional[ast.Stmt]]] = []
+        self._linear_stmts = linear
+
+        def emit(stmt: ast.Stmt) -> None:
+            if type(stmt) not in _SKIP_STMT_TYPES:
+                linear.append((_STMT, stmt))
+
+        def new_node(stmt: Optional[ast.Stmt], uses: AbstractSet[str], defs: AbstractSet[str]) -> int:
+            node_id = len(cfg.stmts)
+            cfg.stmts.append(stmt)
+            cfg.uses.append(self._var_mask(uses))
+            cfg.defs.append(self._var_mask(defs))
+            succs.append([])
+            if stmt is not None:
+                self.stmt_node[id(stmt)] = node_id
+                self._record_borrow_stmt(stmt)
+            return node_id
+
+        def build_block(block: List[ast.Stmt], known_vars: _Scope, nested: bool) -> Tuple[Optional[int], List[int], AbstractSet[str]]:
             entry_id: Optional[int] = None
             exits: List[int] = []
             new_vars: Set[str] = set()
@@ -304,191 +519,241 @@ class BorrowChecker:
                     entry_id = sub_entry
                 for exit_id in exits:
                     if sub_entry is not None:
-                        nodes[exit_id].succs.append(sub_entry)
+                        succs[exit_id].append(sub_entry)
                 exits = sub_exits
                 new_vars |= sub_new
             if nested and new_vars:
-                kill = new_node(None, set(), new_vars)
+                kill = new_node(None, _NO_NAMES, new_vars)
                 for exit_id in exits:
-                    nodes[exit_id].succs.append(kill.node_id)
-                exits = [kill.node_id]
+                    succs[exit_id].append(kill)
+                exits = [kill]
             return entry_id, exits, new_vars
 
-        def register_defs(defs: Set[str], known_vars: Set[str], new_vars: Set[str]) -> None:
+        def register_defs(defs: AbstractSet[str], known_vars: _Scope, new_vars: Set[str]) -> None:
             for name in defs:
                 if name not in known_vars:
                     new_vars.add(name)
                     known_vars.add(name)
 
-        def build_stmt(stmt: ast.Stmt, known_vars: Set[str]) -> Tuple[Optional[int], List[int], Set[str]]:
+        def build_stmt(stmt: ast.Stmt, known_vars: _Scope) -> Tuple[Optional[int], List[int], AbstractSet[str]]:
             if isinstance(stmt, ast.Return):
-                node = new_node(stmt, self._uses_in_stmt(stmt), set())
-                return node.node_id, [], set()
+                emit(stmt)
+                node = new_node(stmt, self._uses_in_stmt(stmt), _NO_NAMES)
+                return node, [], _NO_NAMES
             if isinstance(stmt, ast.UnsafeBlock):
-                return build_block(stmt.body, known_vars, nested=True)
+                linear.append((_PUSH_UNSAFE, None))
+                linear.append((_ENTER_SCOPE, None))
+                result = build_block(stmt.body, known_vars, nested=True)
+                linear.append((_EXIT_SCOPE, None))
+                linear.append((_POP_UNSAFE, None))
+                return result
             if isinstance(stmt, ast.If):
-                header = new_node(stmt, self._uses_in_expr(stmt.condition), set())
-                branch_vars = set(known_vars)
+                linear.append((_HEADER, stmt))
+                linear.append((_ENTER_SCOPE, None))
+                header = new_node(stmt, self._uses_in_expr(stmt.condition), _NO_NAMES)
+                branch_vars = _Scope(known_vars)
                 body_entry, body_exits, body_new = build_block(stmt.body, branch_vars, nested=True)
-                join = new_node(None, set(), body_new)
-                header.succs.append(join.node_id)
+                linear.append((_EXIT_SCOPE, None))
+                if stmt.else_body:
+                    # The CFG does not model else bodies; they are only checked.
+                    linear.append((_ENTER_SCOPE, None))
+                    for inner in stmt.else_body:
+                        emit(inner)
+                    linear.append((_EXIT_SCOPE, None))
+                join = new_node(None, _NO_NAMES, body_new)
+                succs[header].append(join)
                 if body_entry is not None:
-                    header.succs.append(body_entry)
+                    succs[header].append(body_entry)
                     for exit_id in body_exits:
-                        nodes[exit_id].succs.append(join.node_id)
-                return header.node_id, [join.node_id], set()
+                        succs[exit_id].append(join)
+                return header, [join], _NO_NAMES
             if isinstance(stmt, ast.Repeat):
-                header = new_node(stmt, self._uses_in_expr(stmt.count), set())
-                loop_vars = set(known_vars)
+                linear.append((_HEADER, stmt))
+                linear.append((_ENTER_SCOPE, None))
+                header = new_node(stmt, self._uses_in_expr(stmt.count), _NO_NAMES)
+                loop_vars = _Scope(known_vars)
                 body_entry, body_exits, body_new = build_block(stmt.body, loop_vars, nested=False)
-                kill = new_node(None, set(), body_new)
-                header.succs.append(kill.node_id)
+                linear.append((_EXIT_SCOPE, None))
+                kill = new_node(None, _NO_NAMES, body_new)
+                succs[header].append(kill)
                 if body_entry is not None:
-                    header.succs.append(body_entry)
+                    succs[header].append(body_entry)
                     for exit_id in body_exits:
-                        nodes[exit_id].succs.append(header.node_id)
-                return header.node_id, [kill.node_id], set()
+                        succs[exit_id].append(header)
+                return header, [kill], _NO_NAMES
             if isinstance(stmt, ast.While):
-                header = new_node(stmt, self._uses_in_expr(stmt.condition), set())
-                loop_vars = set(known_vars)
+                linear.append((_HEADER, stmt))
+                linear.append((_ENTER_SCOPE, None))
+                header = new_node(stmt, self._uses_in_expr(stmt.condition), _NO_NAMES)
+                loop_vars = _Scope(known_vars)
                 body_entry, body_exits, body_new = build_block(stmt.body, loop_vars, nested=False)
-                kill = new_node(None, set(), body_new)
-                header.succs.append(kill.node_id)
+                linear.append((_EXIT_SCOPE, None))
+                kill = new_node(None, _NO_NAMES, body_new)
+                succs[header].append(kill)
                 if body_entry is not None:
-                    header.succs.append(body_entry)
+                    succs[header].append(body_entry)
                     for exit_id in body_exits:
-                        nodes[exit_id].succs.append(header.node_id)
-                return header.node_id, [kill.node_id], set()
+                        succs[exit_id].append(header)
+                return header, [kill], _NO_NAMES
+            emit(stmt)
             defs = self._defs_in_stmt(stmt)
             node = new_node(stmt, self._uses_in_stmt(stmt), defs)
             new_vars: Set[str] = set()
             register_defs(defs, known_vars, new_vars)
-            return node.node_id, [node.node_id], new_vars
-
-        entry, exits, _ = build_block(stmts, set(), nested=False)
-        return nodes, entry, exits
-
-    def _compute_liveness(self, nodes: List["_CFGNode"]) -> Tuple[Dict[int, Set[str]], Dict[int, Set[str]]]:
-        live_in: Dict[int, Set[str]] = {n.node_id: set() for n in nodes}
-        live_out: Dict[int, Set[str]] = {n.node_id: set() for n in nodes}
-        changed = True
-        while changed:
-            changed = False
-            for node in reversed(nodes):
-                out_set: Set[str] = set()
-                for succ in node.succs:
-                    out_set |= live_in[succ]
-                in_set = node.uses | (out_set - node.defs)
-                if out_set != live_out[node.node_id] or in_set != live_in[node.node_id]:
-                    live_out[node.node_id] = out_set
-                    live_in[node.node_id] = in_set
-                    changed = True
-        return live_in, live_out
-
-    def _collect_borrow_mapping(self, nodes: List["_CFGNode"]) -> Dict[str, str]:
-        mapping: Dict[str, str] = {}
-        for node in nodes:
-            stmt = node.stmt
-            if isinstance(stmt, ast.BorrowSlice):
-                owner = self._extract_name(stmt.buffer)
+            return node, [node], new_vars
+
+        entry, exits, _ = build_block(stmts, _Scope(), nested=False)
+        return cfg, entry, exits
+
+    def _compute_liveness(self, cfg: "_CFG") -> Tuple[List[int], List[int]]:
+        # Live sets are bitmasks over self.var_id.
+        return _liveness_kernel(cfg.uses, cfg.defs, self._preds)
+
+    def _record_borrow_stmt(self, stmt: ast.Stmt) -> None:
+        if isinstance(stmt, ast.BorrowSlice):
+            owner = self._extract_name(stmt.buffer)
+            if owner:
+                self._record_borrow_var(stmt.name, owner, stmt.mutable)
+        elif isinstance(stmt, ast.Assign):
+            if isinstance(stmt.target, ast.Name) and isinstance(stmt.value, ast.BorrowExpr):
+                owner = self._extract_name(stmt.value.value)
                 if owner:
-                    mapping[stmt.name] = owner
-            if isinstance(stmt, ast.Assign):
-                if isinstance(stmt.target, ast.Name) and isinstance(stmt.value, ast.BorrowExpr):
-                    owner = self._extract_name(stmt.value.value)
-                    if owner:
-                        mapping[stmt.target.value] = owner
-        return mapping
+                    self._record_borrow_var(stmt.target.value, owner, stmt.value.mutable)
+
+    def _record_borrow_var(self, var_name: str, owner: str, mutable: bool) -> None:
+        bit = self._var_bit(var_name)
+        previous_owner = self.borrow_var_owner.get(var_name)
+        siblings = self.borrows_by_owner.setdefault(owner, [])
+        if previous_owner is None:
+            self.borrow_var_order[var_name] = len(self.borrow_var_order)
+            siblings.append((var_name, mutable))
+        else:
+            previous = self.borrows_by_owner[previous_owner]
+            index = next(i for i, (name, _) in enumerate(previous) if name == var_name)
+            if previous_owner == owner:
+                previous[index] = (var_name, mutable)
+                return
+            del previous[index]
+            self.borrow_mask_for_owner[previous_owner] &= ~bit
+            # A re-borrowed name keeps its original place, so conflict reports
+            # name the same witness borrow as a scan of borrow_var_owner would.
+            order = self.borrow_var_order
+            index = bisect.bisect(siblings, order[var_name], key=lambda entry: order[entry[0]])
+            siblings.insert(index, (var_name, mutable))
+        self.borrow_var_owner[var_name] = owner
+        self.borrow_mask_for_owner[owner] = self.borrow_mask_for_owner.get(owner, 0) | bit
 
     def _uses_in_stmt(self, stmt: ast.Stmt) -> Set[str]:
         uses: Set[str] = set()
-        if isinstance(stmt, ast.Assign):
-            uses |= self._uses_in_expr(stmt.value)
-        elif isinstance(stmt, ast.AddAssign):
-            uses |= self._uses_in_expr(stmt.target)
-            uses |= self._uses_in_expr(stmt.value)
-        elif isinstance(stmt, ast.Print):
-            uses |= self._uses_in_expr(stmt.value)
-        elif isinstance(stmt, ast.Return) and stmt.value:
-            uses |= self._uses_in_expr(stmt.value)
-        elif isinstance(stmt, ast.While):
-            uses |= self._uses_in_expr(stmt.condition)
-        elif isinstance(stmt, ast.BufferCreate):
-            uses |= self._uses_in_expr(stmt.size)
-        elif isinstance(stmt, ast.BorrowSlice):
-            uses |= self._uses_in_expr(stmt.buffer)
-            uses |= self._uses_in_expr(stmt.start)
-            uses |= self._uses_in_expr(stmt.end)
-        elif isinstance(stmt, ast.Move):
-            uses |= self._uses_in_expr(stmt.src)
-        elif isinstance(stmt, ast.Release):
-            uses |= self._uses_in_expr(stmt.target)
-        elif isinstance(stmt, ast.UnsafeBlock):
-            for inner in stmt.body:
-                uses |= self._uses_in_stmt(inner)
+        self._collect_stmt_uses(stmt, uses)
         return uses
 
-    def _defs_in_stmt(self, stmt: ast.Stmt) -> Set[str]:
-        if isinstance(stmt, ast.Assign) and isinstance(stmt.target, ast.Name):
-            return {stmt.target.value}
-        if isinstance(stmt, ast.AddAssign) and isinstance(stmt.target, ast.Name):
+    def _collect_stmt_uses(self, stmt: ast.Stmt, uses: Set[str]) -> None:
+        stack = [stmt]
+        while stack:
+            current = stack.pop()
+            if type(current) is ast.UnsafeBlock:
+                stack.extend(current.body)
+                continue
+            handler = _lookup_handler(self._stmt_use_handlers, current)
+            if handler is not None:
+                handler(current, uses)
+
+    def _uses_in_assign(self, stmt: ast.Assign, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.value, uses)
+
+    def _uses_in_add_assign(self, stmt: ast.AddAssign, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.target, uses)
+        self._collect_expr_uses(stmt.value, uses)
+
+    def _uses_in_print(self, stmt: ast.Print, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.value, uses)
+
+    def _uses_in_return(self, stmt: ast.Return, uses: Set[str]) -> None:
+        if stmt.value:
+            self._collect_expr_uses(stmt.value, uses)
+
+    def _uses_in_while(self, stmt: ast.While, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.condition, uses)
+
+    def _uses_in_buffer_create(self, stmt: ast.BufferCreate, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.size, uses)
+
+    def _uses_in_borrow_slice(self, stmt: ast.BorrowSlice, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.buffer, uses)
+        self._collect_expr_uses(stmt.start, uses)
+        self._collect_expr_uses(stmt.end, uses)
+
+    def _uses_in_move(self, stmt: ast.Move, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.src, uses)
+
+    def _uses_in_release(self, stmt: ast.Release, uses: Set[str]) -> None:
+        self._collect_expr_uses(stmt.target, uses)
+
+    def _defs_in_stmt(self, stmt: ast.Stmt) -> AbstractSet[str]:
+        handler = _lookup_handler(self._stmt_def_handlers, stmt)
+        if handler is None:
+            return _NO_NAMES
+        return handler(stmt)
+
+    def _defs_in_target(self, stmt: ast.Stmt) -> AbstractSet[str]:
+        if isinstance(stmt.target, ast.Name):
             return {stmt.target.value}
-        if isinstance(stmt, ast.BufferCreate):
-            return {stmt.name}
-        if isinstance(stmt, ast.BorrowSlice):
-            return {stmt.name}
-        if isinstance(stmt, ast.Move):
-            return {stmt.dst}
-        return set()
+        return _NO_NAMES
+
+    def _defs_in_named(self, stmt: ast.Stmt) -> Set[str]:
+        return {stmt.name}
+
+    def _defs_in_move(self, stmt: ast.Move) -> Set[str]:
+        return {stmt.dst}
 
     def _uses_in_expr(self, expr: ast.Expr) -> Set[str]:
         uses: Set[str] = set()
-        if isinstance(expr, ast.Name):
-            uses.add(expr.value)
-        elif isinstance(expr, ast.Call):
-            for arg in expr.args:
-                uses |= self._uses_in_expr(arg)
-        elif isinstance(expr, ast.BorrowExpr):
-            uses |= self._uses_in_expr(expr.value)
-        elif isinstance(expr, ast.CopyExpr):
-            uses |= self._uses_in_expr(expr.value)
-        elif isinstance(expr, ast.MemberAccess):
-            uses |= self._uses_in_expr(expr.value)
-        elif isinstance(expr, ast.BinOp):
-            uses |= self._uses_in_expr(expr.left)
-            uses |= self._uses_in_expr(expr.right)
-        elif isinstance(expr, ast.UnaryOp):
-            uses |= self._uses_in_expr(expr.value)
+        self._collect_expr_uses(expr, uses)
         return uses
 
+    def _collect_expr_uses(self, expr: ast.Expr, uses: Set[str]) -> None:
+        stack = [expr]
+        while stack:
+            current = stack.pop()
+            current_type = type(current)
+            if current_type is ast.Name:
+                uses.add(current.value)
+            elif current_type is ast.Call:
+                stack.extend(current.args)
+            elif current_type is ast.BinOp:
+                stack.append(current.left)
+                stack.append(current.right)
+            elif current_type in _OPERAND_EXPR_TYPES:
+                stack.append(current.value)
+
     def _register_borrow(self, owner: str, mutable: bool, var_name: str, stmt: ast.Stmt) -> None:
         node_id = self.stmt_node.get(id(stmt))
-        live = self.live_in.get(node_id, set()) if node_id is not None else set()
-        for borrow_var, borrow_owner in self.borrow_var_owner.items():
-            if borrow_owner != owner:
-                continue
-            if borrow_var not in live:
-                continue
-            existing_mut = self.borrow_var_mutable.get(borrow_var, False)
-            if mutable or existing_mut:
-                conflict = "mutable" if mutable else "immutable"
-                existing = "mutable" if existing_mut else "immutable"
-                if not self._in_unsafe():
-                    self.errors.append(
-                        self._diag(
-                            stmt,
-                            f"Borrow conflict: {conflict} borrow overlaps {existing} borrow '{borrow_var}'",
+        live = self.live_in[node_id] if node_id is not None else 0
+        # Only the live borrows of this owner can conflict.
+        live &= self.borrow_mask_for_owner.get(owner, 0)
+        if live:
+            for borrow_var, existing_mut in self.borrows_by_owner.get(owner, ()):
+                if not live & self._var_bit(borrow_var):
+                    continue
+                if mutable or existing_mut:
+                    conflict = "mutable" if mutable else "immutable"
+                    existing = "mutable" if existing_mut else "immutable"
+                    if not self._in_unsafe():
+                        self.errors.append(
+                            self._diag(
+                                stmt,
+                                f"Borrow conflict: {conflict} borrow overlaps {existing} borrow '{borrow_var}'",
+                            )
                         )
-                    )
-                    return
+                        return
         info = BorrowInfo(owner=owner, mutable=mutable, var_name=var_name)
         existing = self.active_borrows.get(owner, [])
         existing.append(info)
         self.active_borrows[owner] = existing
-        self.borrow_var_owner[var_name] = owner
-        self.borrow_var_mutable[var_name] = mutable
-        if self.scope_stack:
-            self.scope_stack[-1].append(info)
+        self._record_borrow_var(var_name, owner, mutable)
+        if self.scope_marks:
+            self.scope_borrows.append(info)
 
     def _move_if_needed(
         self,
@@ -505,9 +770,10 @@ class BorrowChecker:
                 if not self._borrows_expired(name, stmt) and not self._in_unsafe():
                     self.errors.append(self._diag(stmt, f"Cannot move '{name}' while it is borrowed"))
                     return
-            self.moved[name] = True
+            index = self._intern(name)
+            self.moved |= 1 << index
             if span:
-                self.moved_at[name] = span
+                self.moved_at[index] = span
 
     def _extract_name(self, expr: ast.Expr) -> Optional[str]:
         if isinstance(expr, ast.Name):
@@ -523,38 +789,30 @@ class BorrowChecker:
         return local_vars.get(name, types.UNIT)
 
     def _enter_scope(self) -> None:
-        self.scope_stack.append([])
+        self.scope_marks.append(len(self.scope_borrows))
 
     def _exit_scope(self) -> None:
-        if not self.scope_stack:
+        if not self.scope_marks:
             return
-        borrows = self.scope_stack.pop()
-        for info in borrows:
-            owner_borrows = self.active_borrows.get(info.owner, [])
-            self.active_borrows[info.owner] = [b for b in owner_borrows if b is not info]
+        start = self.scope_marks.pop()
+        if start == len(self.scope_borrows):
+            return
+        freed: Dict[str, Set[int]] = {}
+        for info in self.scope_borrows[start:]:
+            freed.setdefault(info.owner, set()).add(id(info))
+        del self.scope_borrows[start:]
+        for owner, freed_ids in freed.items():
+            owner_borrows = self.active_borrows.get(owner, [])
+            self.active_borrows[owner] = [b for b in owner_borrows if id(b) not in freed_ids]
 
     def _in_unsafe(self) -> bool:
         return bool(self.unsafe_stack and self.unsafe_stack[-1])
 
     def _resolve_type(self, tref: ast.TypeRef) -> types.Type:
-        name = tref.name
-        if name in ("int", "정수"):
-            return types.INT
-        if name in ("bool", "불리언"):
-            return types.BOOL
-        if name in ("string", "문자열"):
-            return types.STRING
-        if name in ("buffer", "버퍼"):
-            return types.BUFFER
-        if name in ("view", "뷰"):
-            return types.VIEW
-        if name in ("tensor", "텐서"):
-            return types.TENSOR
-        if name in ("channel", "채널"):
-            return types.CHANNEL
-        if name in ("unit", "void", "없음"):
-            return types.UNIT
-        return types.Type(name=name, is_copy=False)
+        builtin = _BUILTIN_TYPES.get(tref.name)
+        if builtin is not None:
+            return builtin
+        return _user_type(tref.name)
 
     def _diag(self, node: object, message: str) -> diagnostics.Diagnostic:
         span = getattr(node, "span", None) if node is not None else None
@@ -563,3 +821,49 @@ class BorrowChecker:
         return diagnostics.Diagnostic(message=message, span=span)
 
 
+def _liveness_kernel(uses: List[int], defs: List[int], preds: List[List[int]]) -> Tuple[List[int], List[int]]:
+    count = len(uses)
+    live_in = list(uses)
+    live_out = [0] * count
+    # Live sets only grow, so each change to a node's live-in is OR-ed into its
+    # predecessors' live-out, and a predecessor is requeued only if that added
+    # a bit to its live-in. Nodes without uses start empty and need no seeding.
+    worklist = deque(node_id for node_id in range(count - 1, -1, -1) if uses[node_id])
+    queued = bytearray(count)
+    for node_id in worklist:
+        queued[node_id] = 1
+    pop = worklist.popleft
+    push = worklist.append
+    while worklist:
+        node_id = pop()
+        queued[node_id] = 0
+        in_mask = live_in[node_id]
+        for pred in preds[node_id]:
+            out_mask = live_out[pred] | in_mask
+            if out_mask == live_out[pred]:
+                continue
+            live_out[pred] = out_mask
+            pred_in = uses[pred] | (out_mask & ~defs[pred])
+            if pred_in != live_in[pred]:
+                live_in[pred] = pred_in
+                if not queued[pred]:
+                    queued[pred] = 1
+                    push(pred)
+    return live_in, live_out
+
+
+def _lookup_handler(handlers: Dict[type, Callable], node: object) -> Optional[Callable]:
+    handler = handlers.get(type(node))
+    if handler is not None:
+        return handler
+    # Subclasses of AST nodes miss the exact-type lookup.
+    for node_type, candidate in handlers.items():
+        if isinstance(node, node_type):
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=None)
+def _user_type(name: str) -> types.Type:
+    return types.Type(name=name, is_copy=False)
+
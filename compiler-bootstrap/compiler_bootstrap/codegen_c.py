@@ -1,9 +1,72 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import operator
+import re
+from typing import Callable, Dict, List, Optional
 
 from compiler_core import abi, ir
 
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+# \W is exactly "not str.isalnum() and not '_'", non-ASCII letters included.
+_NON_WORD_CHAR = re.compile(r"\W")
+
+# Intrinsics that are a single runtime call:
+# callee -> (C type, C function, result type, result is owned).
+_CALL_INTRINSICS: Dict[str, tuple[str, str, str, bool]] = {
+    "vec_new": ("DaisyVec*", "daisy_vec_new", "vec", True),
+    "vec_len": ("int64_t", "daisy_vec_len", "int", False),
+    "vec_get": ("int64_t", "daisy_vec_get", "int", False),
+    "str_len": ("int64_t", "daisy_str_len", "int", False),
+    "str_char_at": ("int64_t", "daisy_str_char_at", "int", False),
+    "str_find_char": ("int64_t", "daisy_str_find_char", "int", False),
+    "str_starts_with": ("int64_t", "daisy_str_starts_with", "int", False),
+    "str_to_int": ("int64_t", "daisy_str_to_int", "int", False),
+    "str_substr": ("const char*", "daisy_str_substr", "string", True),
+    "str_trim": ("const char*", "daisy_str_trim", "string", True),
+    "str_escape_json": ("const char*", "daisy_str_escape_json", "string", True),
+    "str_concat": ("const char*", "daisy_str_concat", "string", True),
+    "int_to_str": ("const char*", "daisy_int_to_str", "string", True),
+    "file_read": ("const char*", "daisy_file_read", "string", True),
+    "file_write": ("int64_t", "daisy_file_write", "int", False),
+    "module_load": ("const char*", "daisy_module_load", "string", True),
+    "error_last": ("const char*", "daisy_error_last", "string", False),
+    "channel": ("DaisyChannel*", "daisy_channel_create", "channel", True),
+    "recv": ("int64_t", "daisy_channel_recv", "int", False),
+}
+
+# Runtime calls without a value; a result name, if any, is bound to 0.
+_CALL_VOID_INTRINSICS: Dict[str, str] = {
+    "vec_push": "daisy_vec_push",
+    "vec_release": "daisy_vec_release",
+    "error_clear": "daisy_error_clear",
+    "panic": "daisy_panic",
+    "send": "daisy_channel_send",
+    "channel_close": "daisy_channel_close",
+}
+
+# Both tables with their fixed line fragments joined once at import, so
+# emitting a call only splices in the result name and arguments.
+_CALL_INTRINSIC_LINES: Dict[str, tuple[str, str, str, bool]] = {
+    callee: (f"  {c_type} ", f" = {c_name}(", result_type, owned)
+    for callee, (c_type, c_name, result_type, owned) in _CALL_INTRINSICS.items()
+}
+_CALL_VOID_INTRINSIC_LINES: Dict[str, str] = {callee: f"  {c_name}(" for callee, c_name in _CALL_VOID_INTRINSICS.items()}
+
+# Integer builtins lowered to inline C, folded when both operands are known:
+# callee -> (text before the left operand, operator, text after the right one, fold).
+_CALL_INT_BINOPS: Dict[str, tuple[str, str, str, Callable[[int, int], int]]] = {
+    "int_add": (" = ", " + ", ";", operator.add),
+    "int_sub": (" = ", " - ", ";", operator.sub),
+    "gt": (" = (", " > ", ");", operator.gt),
+    "lt": (" = (", " < ", ");", operator.lt),
+    "eq": (" = (", " == ", ");", operator.eq),
+    "ge": (" = (", " >= ", ");", operator.ge),
+    "le": (" = (", " <= ", ");", operator.le),
+    "ne": (" = (", " != ", ");", operator.ne),
+}
+
 
 class CCodegen:
     def emit(self, module: ir.IRModule, extern_signatures: dict[str, tuple[str, list[str], str]] | None = None) -> str:
@@ -14,64 +77,128 @@ class CCodegen:
         self.extern_signatures = extern_signatures or {}
         self.structs = {s.name: s for s in module.structs}
         self.enums = {e.name: e for e in module.enums}
+        # First match wins, as with the linear scans these replace.
+        self._struct_fields: Dict[str, Dict[str, str]] = {}
+        for struct in self.structs.values():
+            field_types: Dict[str, str] = {}
+            for field in struct.fields:
+                field_types.setdefault(field.name, field.type_name)
+            self._struct_fields[struct.name] = field_types
+        self._enum_cases: Dict[str, Dict[str, tuple[int, Optional[str]]]] = {}
+        for enum in self.enums.values():
+            cases: Dict[str, tuple[int, Optional[str]]] = {}
+            for idx, case in enumerate(enum.cases):
+                cases.setdefault(case.name, (idx, case.payload))
+            self._enum_cases[enum.name] = cases
+        # Name lookups repeat for every instruction; each emit() starts fresh
+        # because the answers depend on this module's structs and enums.
+        self._map_type_cache: Dict[str, str] = {}
+        self._struct_name_cache: Dict[str, str] = {}
+        self._enum_name_cache: Dict[str, str] = {}
+        self._sanitize_cache: Dict[str, str] = {}
+        self._mangle_cache: Dict[tuple[str, str], str] = {}
+        map_type = self._map_type
+        format_params = self._format_params
+        mangled = self._mangled
+        module_name = self.module_name
+        extern_signatures = self.extern_signatures
         lines: List[str] = []
-        lines.append("#include <stdint.h>")
-        lines.append('#include "rt.h"')
-        lines.append("")
+        append = lines.append
+        append("#include <stdint.h>")
+        append('#include "rt.h"')
+        append("")
         for struct in module.structs:
-            lines.append(f"typedef struct {self._struct_type_name(struct.name)} {{")
+            struct_type = self._struct_type_name(struct.name)
+            append(f"typedef struct {struct_type} {{")
             for field in struct.fields:
-                lines.append(f"  {self._map_type(field.type_name)} {field.name};")
-            lines.append(f"}} {self._struct_type_name(struct.name)};")
+                append(f"  {map_type(field.type_name)} {field.name};")
+            append(f"}} {struct_type};")
         for enum in module.enums:
-            lines.append(f"typedef struct {self._enum_type_name(enum.name)} {{")
-            lines.append("  int64_t tag;")
-            lines.append("  union {")
+            enum_type = self._enum_type_name(enum.name)
+            append(f"typedef struct {enum_type} {{")
+            append("  int64_t tag;")
+            append("  union {")
             for case in enum.cases:
                 if case.payload:
-                    lines.append(f"    {self._map_type(case.payload)} {case.name};")
-            lines.append("  } data;")
-            lines.append(f"}} {self._enum_type_name(enum.name)};")
+                    append(f"    {map_type(case.payload)} {case.name};")
+            append("  } data;")
+            append(f"}} {enum_type};")
         if module.structs or module.enums:
-            lines.append("")
-        for ext in module.externs:
-            params = ", ".join([f"{self._map_type(p.type_name)} {p.name}" for p in ext.params])
-            lines.append(f"extern {self._map_type(ext.return_type)} {ext.name}({params});")
+            append("")
+        # Each declaration section goes in as one pre-joined string.
+        if module.externs:
+            append(
+                "\n".join(
+                    [
+                        f"extern {map_type(ext.return_type)} {ext.name}({format_params(ext.params)});"
+                        for ext in module.externs
+                    ]
+                )
+            )
         extern_used: Dict[str, tuple[list[str], str]] = {}
-        for func in module.functions:
-            for block in func.blocks:
-                for instr in block.instructions:
-                    if instr.op == "call" and "." in instr.args[0]:
-                        callee = instr.args[0]
-                        if callee in self.extern_signatures:
-                            _, params, ret = self.extern_signatures[callee]
-                            extern_used[callee] = (params, ret)
-        for callee, (params, ret) in sorted(extern_used.items()):
-            mod_name, fn_name = callee.split(".", 1)
-            param_sig = ", ".join([f"{self._map_type(p)} arg_{idx}" for idx, p in enumerate(params)])
-            lines.append(f"extern {self._map_type(ret)} {abi.mangle(mod_name, fn_name)}({param_sig});")
+        # Without signatures no call can match, so skip walking the module.
+        if extern_signatures:
+            for func in module.functions:
+                for block in func.blocks:
+                    for instr in block.instructions:
+                        if instr.op == "call" and "." in instr.args[0]:
+                            callee = instr.args[0]
+                            if callee in extern_signatures:
+                                _, params, ret = extern_signatures[callee]
+                                extern_used[callee] = (params, ret)
+        # The walk above is deterministic, so first-use order is stable.
+        if extern_used:
+            extern_decl = self._extern_call_decl
+            append("\n".join([extern_decl(callee, params, ret) for callee, (params, ret) in extern_used.items()]))
         if module.externs:
-            lines.append("")
-        for func in module.functions:
-            if func.name == "main":
-                continue
-            ret_type = self._map_type(func.return_type)
-            params = ", ".join([f"{self._map_type(p.type_name)} {p.name}" for p in func.params])
-            lines.append(f"{ret_type} {abi.mangle(self.module_name, func.name)}({params});")
+            append("")
+        forward_decls = [
+            f"{map_type(func.return_type)} {mangled(module_name, func.name)}({format_params(func.params)});"
+            for func in module.functions
+            if func.name != "main"
+        ]
+        if forward_decls:
+            append("\n".join(forward_decls))
         if module.functions:
-            lines.append("")
+            append("")
+        emit_function = self._emit_function
         for func in module.functions:
-            lines.extend(self._emit_function(func))
-            lines.append("")
+            emit_function(func, lines)
+            append("")
         return "\n".join(lines)
 
+    def _format_params(self, params: List[ir.IRParam]) -> str:
+        map_type = self._map_type
+        return ", ".join([f"{map_type(p.type_name)} {p.name}" for p in params])
+
+    def _extern_call_decl(self, callee: str, params: List[str], ret: str) -> str:
+        map_type = self._map_type
+        mod_name, fn_name = callee.split(".", 1)
+        param_sig = ", ".join([f"{map_type(p)} arg_{idx}" for idx, p in enumerate(params)])
+        return f"extern {map_type(ret)} {self._mangled(mod_name, fn_name)}({param_sig});"
+
+    def _mangled(self, module_name: str, name: str) -> str:
+        key = (module_name, name)
+        mangled = self._mangle_cache.get(key)
+        if mangled is None:
+            mangled = self._mangle_cache[key] = abi.mangle(module_name, name)
+        return mangled
+
     def _struct_type_name(self, name: str) -> str:
-        mod_name, type_name = self._split_type_name(name)
-        return f"daisy_struct_{mod_name}__{self._sanitize_type_name(type_name)}"
+        c_name = self._struct_name_cache.get(name)
+        if c_name is None:
+            mod_name, type_name = self._split_type_name(name)
+            c_name = f"daisy_struct_{mod_name}__{self._sanitize_type_name(type_name)}"
+            self._struct_name_cache[name] = c_name
+        return c_name
 
     def _enum_type_name(self, name: str) -> str:
-        mod_name, type_name = self._split_type_name(name)
-        return f"daisy_enum_{mod_name}__{self._sanitize_type_name(type_name)}"
+        c_name = self._enum_name_cache.get(name)
+        if c_name is None:
+            mod_name, type_name = self._split_type_name(name)
+            c_name = f"daisy_enum_{mod_name}__{self._sanitize_type_name(type_name)}"
+            self._enum_name_cache[name] = c_name
+        return c_name
 
     def _split_type_name(self, name: str) -> tuple[str, str]:
         if "." in name:
@@ -80,390 +207,417 @@ class CCodegen:
         return self.module_name, name
 
     def _sanitize_type_name(self, name: str) -> str:
-        return "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in name)
+        sanitized = self._sanitize_cache.get(name)
+        if sanitized is None:
+            sanitized = _NON_WORD_CHAR.sub("_", name)
+            self._sanitize_cache[name] = sanitized
+        return sanitized
 
-    def _emit_function(self, func: ir.IRFunction) -> List[str]:
-        lines: List[str] = []
+    def _emit_function(self, func: ir.IRFunction, lines: List[str]) -> None:
         ret_type = self._map_type(func.return_type)
-        params = ", ".join([f"{self._map_type(p.type_name)} {p.name}" for p in func.params])
+        params = self._format_params(func.params)
         if func.name == "main":
             lines.append(f"{ret_type} {func.name}({params}) {{")
         else:
-            lines.append(f"{ret_type} {abi.mangle(self.module_name, func.name)}({params}) {{")
-        var_types: Dict[str, str] = {}
-        owned_types: Dict[str, str] = {}
-        released: Dict[str, bool] = {}
-        escaped: Dict[str, bool] = {}
+            lines.append(f"{ret_type} {self._mangled(self.module_name, func.name)}({params}) {{")
+        # Per-function state read and updated by the instruction handlers.
+        self.var_types: Dict[str, str] = {}
+        self.owned_types: Dict[str, str] = {}
+        self.released: set[str] = set()
+        self.escaped: set[str] = set()
         for param in func.params:
-            var_types[param.name] = param.type_name
+            self.var_types[param.name] = param.type_name
         const_values: Dict[str, int] = {}
         release_targets: set[str] = set()
         escape_candidates: set[str] = set()
-        for block in func.blocks:
-            for instr in block.instructions:
-                if instr.op == "const":
-                    try:
-                        const_values[instr.result] = int(instr.args[0])
-                    except ValueError:
-                        pass
-                if instr.op == "release" and instr.args:
+        defined = {param.name for param in func.params}
+        redefined: set[str] = set()
+        read_names: set[str] = set()
+        instrs = [instr for block in func.blocks for instr in block.instructions]
+        # buf_create looks ahead at later releases and escapes, so this scan
+        # has to finish before emission starts.
+        for instr in instrs:
+            op = instr.op
+            result = instr.result
+            read_names.update(instr.args)
+            if result:
+                if result in defined:
+                    redefined.add(result)
+                else:
+                    defined.add(result)
+            if op == "call":
+                escape_candidates.update(instr.args[1:])
+            elif op == "const":
+                text = instr.args[0]
+                try:
+                    value = int(text)
+                except ValueError:
+                    pass
+                else:
+                    # Only literals C reads the same way, e.g. not "010".
+                    if str(value) == text and _INT64_MIN < value <= _INT64_MAX:
+                        const_values[result] = value
+            elif op == "release":
+                if instr.args:
                     release_targets.add(instr.args[0])
-                if instr.op == "call":
-                    escape_candidates.update(instr.args[1:])
-                if instr.op == "ret" and instr.args:
+            elif op == "ret":
+                if instr.args:
                     escape_candidates.add(instr.args[0])
-        for block in func.blocks:
-            for instr in block.instructions:
-                lines.extend(
-                    self._emit_instr(
-                        instr,
-                        var_types,
-                        owned_types,
-                        released,
-                        escaped,
-                        const_values,
-                        release_targets,
-                        escape_candidates,
-                    )
-                )
+            elif op == "inc":
+                if instr.args:
+                    redefined.add(instr.args[0])
+        # A name is only a constant if nothing else ever writes it.
+        for name in redefined:
+            const_values.pop(name, None)
+        self.const_values = const_values
+        self.redefined = redefined
+        self.read_names = read_names
+        self.release_targets = release_targets
+        self.escape_candidates = escape_candidates
+        # Dispatch inline: a helper frame per instruction costs more than
+        # most handlers spend assembling their line.
+        handlers = self._OP_HANDLERS
+        for instr in instrs:
+            handler = handlers.get(instr.op)
+            if handler is None:
+                raise RuntimeError(f"Unsupported IR op: {instr.op}")
+            handler(self, instr, lines)
         if func.return_type == "unit":
             lines.append("  return 0;")
         lines.append("}")
-        return lines
 
-    def _emit_instr(
+    def _emit_const(self, instr: ir.Instr, out: List[str]) -> None:
+        result = instr.result
+        out.append(f"  int64_t {result} = {instr.args[0]};")
+        self.var_types[result] = "int"
+
+    def _emit_const_str(self, instr: ir.Instr, out: List[str]) -> None:
+        result = instr.result
+        out.append(f'  const char* {result} = "{_escape(instr.args[0])}";')
+        self.var_types[result] = "string"
+
+    def _emit_assign(self, instr: ir.Instr, out: List[str]) -> None:
+        var_types = self.var_types
+        owned_types = self.owned_types
+        result = instr.result
+        value = instr.args[0]
+        if result not in var_types:
+            value_type = var_types[result] = var_types.get(value, "int")
+            out.append(f"  {self._map_type(value_type)} {result} = {value};")
+        else:
+            out.append(f"  {result} = {value};")
+        if value in owned_types and result != value:
+            owned_types[result] = owned_types.pop(value)
+        const_values = self.const_values
+        known = const_values.get(value)
+        if known is not None and result not in self.redefined:
+            const_values[result] = known
+
+    def _const_operands(self, args: List[str]) -> Optional[tuple[int, int]]:
+        left = self.const_values.get(args[0])
+        if left is None:
+            return None
+        right = self.const_values.get(args[1])
+        if right is None:
+            return None
+        return left, right
+
+    def _emit_folded(self, instr: ir.Instr, value: int, out: List[str]) -> bool:
+        # Leave anything that would overflow int64_t to the C compiler.
+        if not _INT64_MIN < value <= _INT64_MAX:
+            return False
+        result = instr.result
+        out.append(f"  int64_t {result} = {value};")
+        self.var_types[result] = "int"
+        if result not in self.redefined:
+            self.const_values[result] = value
+        return True
+
+    def _emit_add(self, instr: ir.Instr, out: List[str]) -> None:
+        operands = self._const_operands(instr.args)
+        if operands is not None and self._emit_folded(instr, operands[0] + operands[1], out):
+            return
+        out.append(f"  int64_t {instr.result} = {instr.args[0]} + {instr.args[1]};")
+        self.var_types[instr.result] = "int"
+
+    def _emit_sub(self, instr: ir.Instr, out: List[str]) -> None:
+        operands = self._const_operands(instr.args)
+        if operands is not None and self._emit_folded(instr, operands[0] - operands[1], out):
+            return
+        out.append(f"  int64_t {instr.result} = {instr.args[0]} - {instr.args[1]};")
+        self.var_types[instr.result] = "int"
+
+    def _emit_mul(self, instr: ir.Instr, out: List[str]) -> None:
+        operands = self._const_operands(instr.args)
+        if operands is not None and self._emit_folded(instr, operands[0] * operands[1], out):
+            return
+        out.append(f"  int64_t {instr.result} = {instr.args[0]} * {instr.args[1]};")
+        self.var_types[instr.result] = "int"
+
+    def _emit_div(self, instr: ir.Instr, out: List[str]) -> None:
+        operands = self._const_operands(instr.args)
+        if operands is not None and operands[1] != 0:
+            left, right = operands
+            # C division truncates toward zero.
+            quotient = abs(left) // abs(right)
+            if (left < 0) != (right < 0):
+                quotient = -quotient
+            if self._emit_folded(instr, quotient, out):
+                return
+        out.append(f"  int64_t {instr.result} = {instr.args[0]} / {instr.args[1]};")
+        self.var_types[instr.result] = "int"
+
+    def _emit_neg(self, instr: ir.Instr, out: List[str]) -> None:
+        value = self.const_values.get(instr.args[0])
+        if value is not None and self._emit_folded(instr, -value, out):
+            return
+        out.append(f"  int64_t {instr.result} = -{instr.args[0]};")
+        self.var_types[instr.result] = "int"
+
+    def _emit_print(self, instr: ir.Instr, out: List[str]) -> None:
+        value = instr.args[0]
+        vtype = self.var_types.get(value, "int")
+        if vtype == "string":
+            out.append(f"  daisy_print_str({value});")
+        else:
+            out.append(f"  daisy_print_int({value});")
+
+    def _emit_ret(self, instr: ir.Instr, out: List[str]) -> None:
+        if instr.args and instr.args[0] in self.owned_types:
+            self.escaped.add(instr.args[0])
+        self._emit_cleanup(out, self.owned_types, self.released, self.escaped)
+        out.append(f"  return {instr.args[0]};")
+
+    def _emit_buf_create(self, instr: ir.Instr, out: List[str]) -> None:
+        result = instr.result
+        size_arg = instr.args[0]
+        size_const = self.const_values.get(size_arg)
+        if (
+            size_const is not None
+            and size_const > 0
+            and result not in self.release_targets
+            and result not in self.escape_candidates
+        ):
+            out.append(f"  uint8_t {result}_stack[{size_const}];")
+            out.append(f"  DaisyBuffer {result} = (DaisyBuffer){{ {result}_stack, {size_const} }};")
+            self.var_types[result] = "buffer"
+            self.owned_types[result] = "buffer_stack"
+        else:
+            out.append(f"  DaisyBuffer {result} = daisy_buffer_create({size_arg});")
+            self.var_types[result] = "buffer"
+            self.owned_types[result] = "buffer"
+
+    def _emit_buf_borrow(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(
+            f"  DaisyView {instr.result} = daisy_buffer_borrow(&{instr.args[0]}, {instr.args[1]}, {instr.args[2]}, {instr.args[3]});"
+        )
+        self.var_types[instr.result] = "view"
+
+    def _emit_release(self, instr: ir.Instr, out: List[str]) -> None:
+        target = instr.args[0]
+        t = self.var_types.get(target)
+        if t == "buffer":
+            out.append(f"  daisy_buffer_release(&{target});")
+            self.released.add(target)
+        elif t == "tensor":
+            out.append(f"  daisy_tensor_release(&{target});")
+            self.released.add(target)
+        elif t == "channel":
+            out.append(f"  daisy_channel_release({target});")
+            self.released.add(target)
+        elif t == "string":
+            out.append(f"  daisy_str_release({target});")
+            self.released.add(target)
+        elif t == "vec":
+            out.append(f"  daisy_vec_release({target});")
+            self.released.add(target)
+
+    def _emit_struct_new(self, instr: ir.Instr, out: List[str]) -> None:
+        result = instr.result
+        struct_name = instr.args[0]
+        args = instr.args[1:]
+        c_type = self._map_type(struct_name)
+        out.append(f"  {c_type} {result};")
+        fields = self.structs.get(struct_name)
+        if fields:
+            for field, arg in zip(fields.fields, args):
+                out.append(f"  {result}.{field.name} = {arg};")
+        self.var_types[result] = struct_name
+
+    def _emit_struct_get(self, instr: ir.Instr, out: List[str]) -> None:
+        base, field = instr.args
+        var_types = self.var_types
+        base_type = var_types.get(base)
+        field_type = self._struct_field_type(base_type, field) or "int"
+        if base_type and base_type in self.structs:
+            c_type = self._map_type(field_type)
+        else:
+            c_type = "int64_t"
+        out.append(f"  {c_type} {instr.result} = {base}.{field};")
+        var_types[instr.result] = field_type
+
+    def _emit_struct_set(self, instr: ir.Instr, out: List[str]) -> None:
+        base, field, value = instr.args
+        out.append(f"  {base}.{field} = {value};")
+
+    def _emit_enum_make(self, instr: ir.Instr, out: List[str]) -> None:
+        result = instr.result
+        args = instr.args
+        enum_name, case_name = args[0], args[1]
+        payload = args[2] if len(args) > 2 else None
+        enum_type = self._map_type(enum_name)
+        out.append(f"  {enum_type} {result};")
+        out.append(f"  {result}.tag = {self._enum_case_index(enum_name, case_name)};")
+        if payload:
+            out.append(f"  {result}.data.{case_name} = {payload};")
+        self.var_types[result] = enum_name
+
+    def _emit_enum_payload(self, instr: ir.Instr, out: List[str]) -> None:
+        enum_val, case_name = instr.args
+        enum_type = self.var_types.get(enum_val)
+        payload_type = self._enum_case_payload_type(enum_type, case_name) if enum_type else None
+        c_type = self._map_type(payload_type or "int")
+        out.append(f"  {c_type} {instr.result} = {enum_val}.data.{case_name};")
+        self.var_types[instr.result] = payload_type or "int"
+
+    def _emit_call(self, instr: ir.Instr, out: List[str]) -> None:
+        callee = instr.args[0]
+        args = instr.args[1:]
+        var_types = self.var_types
+        escaped = self.escaped
+        for arg in args:
+            if var_types.get(arg) in ("buffer", "tensor", "channel", "string", "vec"):
+                escaped.add(arg)
+        spec = _CALL_INTRINSIC_LINES.get(callee)
+        if spec is not None:
+            result = instr.result
+            head, call, result_type, owned = spec
+            out.append(f"{head}{result}{call}{', '.join(args)});")
+            var_types[result] = result_type
+            if owned:
+                self.owned_types[result] = result_type
+            return
+        call = _CALL_VOID_INTRINSIC_LINES.get(callee)
+        if call is not None:
+            self._bind_unit_result(instr, out)
+            out.append(f"{call}{', '.join(args)});")
+            return
+        binop = _CALL_INT_BINOPS.get(callee)
+        if binop is not None:
+            self._call_int_binop(instr, args, binop, out)
+            return
+        handler = self._CALL_HANDLERS.get(callee)
+        if handler is None:
+            self._emit_user_call(instr, callee, args, out)
+        else:
+            handler(self, instr, args, out)
+
+    def _bind_unit_result(self, instr: ir.Instr, out: List[str]) -> None:
+        # Calls without a value bind their result to 0; skip that if it is never read.
+        result = instr.result
+        if result and (result in self.read_names or result in self.redefined):
+            out.append(f"  int64_t {result} = 0;")
+            self.var_types[result] = "int"
+
+    def _call_int_binop(
         self,
         instr: ir.Instr,
-        var_types: Dict[str, str],
-        owned_types: Dict[str, str],
-        released: Dict[str, bool],
-        escaped: Dict[str, bool],
-        const_values: Dict[str, int],
-        release_targets: set[str],
-        escape_candidates: set[str],
-    ) -> List[str]:
-        out: List[str] = []
-        if instr.op == "const":
-            out.append(f"  int64_t {instr.result} = {instr.args[0]};")
-            var_types[instr.result] = "int"
-        elif instr.op == "const_str":
-            out.append(f'  const char* {instr.result} = "{_escape(instr.args[0])}";')
-            var_types[instr.result] = "string"
-        elif instr.op == "assign":
-            value = instr.args[0]
-            if instr.result not in var_types:
-                var_types[instr.result] = var_types.get(value, "int")
-                out.append(f"  {self._map_type(var_types[instr.result])} {instr.result} = {value};")
-            else:
-                out.append(f"  {instr.result} = {value};")
-            if value in owned_types and instr.result != value:
-                owned_types[instr.result] = owned_types[value]
-                del owned_types[value]
-        elif instr.op == "add":
-            out.append(f"  int64_t {instr.result} = {instr.args[0]} + {instr.args[1]};")
-            var_types[instr.result] = "int"
-        elif instr.op == "sub":
-            out.append(f"  int64_t {instr.result} = {instr.args[0]} - {instr.args[1]};")
-            var_types[instr.result] = "int"
-        elif instr.op == "mul":
-            out.append(f"  int64_t {instr.result} = {instr.args[0]} * {instr.args[1]};")
-            var_types[instr.result] = "int"
-        elif instr.op == "div":
-            out.append(f"  int64_t {instr.result} = {instr.args[0]} / {instr.args[1]};")
-            var_types[instr.result] = "int"
-        elif instr.op == "neg":
-            out.append(f"  int64_t {instr.result} = -{instr.args[0]};")
-            var_types[instr.result] = "int"
-        elif instr.op == "print":
-            value = instr.args[0]
-            vtype = var_types.get(value, "int")
-            if vtype == "string":
-                out.append(f"  daisy_print_str({value});")
-            else:
-                out.append(f"  daisy_print_int({value});")
-        elif instr.op == "ret":
-            if instr.args and instr.args[0] in owned_types:
-                escaped[instr.args[0]] = True
-            out.extend(self._emit_cleanup(owned_types, released, escaped))
-            out.append(f"  return {instr.args[0]};")
-        elif instr.op == "buf_create":
-            size_arg = instr.args[0]
-            size_const = const_values.get(size_arg)
-            if (
-                size_const is not None
-                and size_const > 0
-                and instr.result not in release_targets
-                and instr.result not in escape_candidates
-            ):
-                out.append(f"  uint8_t {instr.result}_stack[{size_const}];")
-                out.append(f"  DaisyBuffer {instr.result} = (DaisyBuffer){{ {instr.result}_stack, {size_const} }};")
-                var_types[instr.result] = "buffer"
-                owned_types[instr.result] = "buffer_stack"
-            else:
-                out.append(f"  DaisyBuffer {instr.result} = daisy_buffer_create({instr.args[0]});")
-                var_types[instr.result] = "buffer"
-                owned_types[instr.result] = "buffer"
-        elif instr.op == "buf_borrow":
-            out.append(
-                f"  DaisyView {instr.result} = daisy_buffer_borrow(&{instr.args[0]}, {instr.args[1]}, {instr.args[2]}, {instr.args[3]});"
-            )
-            var_types[instr.result] = "view"
-        elif instr.op == "release":
-            target = instr.args[0]
-            t = var_types.get(target)
-            if t == "buffer":
-                out.append(f"  daisy_buffer_release(&{target});")
-                released[target] = True
-            elif t == "tensor":
-                out.append(f"  daisy_tensor_release(&{target});")
-                released[target] = True
-            elif t == "channel":
-                out.append(f"  daisy_channel_release({target});")
-                released[target] = True
-            elif t == "string":
-                out.append(f"  daisy_str_release({target});")
-                released[target] = True
-            elif t == "vec":
-                out.append(f"  daisy_vec_release({target});")
-                released[target] = True
-        elif instr.op == "struct_new":
-            struct_name = instr.args[0]
-            args = instr.args[1:]
-            c_type = self._map_type(struct_name)
-            out.append(f"  {c_type} {instr.result};")
-            fields = self.structs.get(struct_name)
-            if fields:
-                for idx, field in enumerate(fields.fields):
-                    if idx < len(args):
-                        out.append(f"  {instr.result}.{field.name} = {args[idx]};")
-            var_types[instr.result] = struct_name
-        elif instr.op == "struct_get":
-            base, field = instr.args
-            base_type = var_types.get(base)
-            if base_type and base_type in self.structs:
-                c_type = self._map_type(self._struct_field_type(base_type, field) or "int")
-            else:
-                c_type = "int64_t"
-            out.append(f"  {c_type} {instr.result} = {base}.{field};")
-            var_types[instr.result] = self._struct_field_type(base_type, field) or "int"
-        elif instr.op == "struct_set":
-            base, field, value = instr.args
-            out.append(f"  {base}.{field} = {value};")
-        elif instr.op == "enum_make":
-            enum_name, case_name = instr.args[0], instr.args[1]
-            payload = instr.args[2] if len(instr.args) > 2 else None
-            enum_type = self._map_type(enum_name)
-            out.append(f"  {enum_type} {instr.result};")
-            out.append(f"  {instr.result}.tag = {self._enum_case_index(enum_name, case_name)};")
-            if payload:
-                out.append(f"  {instr.result}.data.{case_name} = {payload};")
-            var_types[instr.result] = enum_name
-        elif instr.op == "enum_payload":
-            enum_val, case_name = instr.args
-            enum_type = var_types.get(enum_val)
-            payload_type = self._enum_case_payload_type(enum_type, case_name) if enum_type else None
-            c_type = self._map_type(payload_type or "int")
-            out.append(f"  {c_type} {instr.result} = {enum_val}.data.{case_name};")
-            var_types[instr.result] = payload_type or "int"
-        elif instr.op == "call":
-            callee = instr.args[0]
-            args = instr.args[1:]
-            for arg in args:
-                if var_types.get(arg) in ("buffer", "tensor", "channel", "string", "vec"):
-                    escaped[arg] = True
-            if callee == "int_add":
-                out.append(f"  int64_t {instr.result} = {args[0]} + {args[1]};")
-                var_types[instr.result] = "int"
-            elif callee == "int_sub":
-                out.append(f"  int64_t {instr.result} = {args[0]} - {args[1]};")
-                var_types[instr.result] = "int"
-            elif callee == "gt":
-                out.append(f"  int64_t {instr.result} = ({args[0]} > {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "lt":
-                out.append(f"  int64_t {instr.result} = ({args[0]} < {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "eq":
-                out.append(f"  int64_t {instr.result} = ({args[0]} == {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "ge":
-                out.append(f"  int64_t {instr.result} = ({args[0]} >= {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "le":
-                out.append(f"  int64_t {instr.result} = ({args[0]} <= {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "ne":
-                out.append(f"  int64_t {instr.result} = ({args[0]} != {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "tensor_matmul":
-                if len(args) == 0:
-                    out.append(f"  DaisyTensor {instr.result} = daisy_tensor_create(1, 1);")
-                elif len(args) == 2:
-                    out.append(f"  DaisyTensor {instr.result} = daisy_tensor_matmul({', '.join(args)});")
-                else:
-                    raise RuntimeError("tensor_matmul expects 0 or 2 args")
-                var_types[instr.result] = "tensor"
-                owned_types[instr.result] = "tensor"
-            elif callee == "vec_new":
-                out.append(f"  DaisyVec* {instr.result} = daisy_vec_new();")
-                var_types[instr.result] = "vec"
-                owned_types[instr.result] = "vec"
-            elif callee == "vec_push":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append(f"  daisy_vec_push({args[0]}, {args[1]});")
-            elif callee == "vec_len":
-                out.append(f"  int64_t {instr.result} = daisy_vec_len({args[0]});")
-                var_types[instr.result] = "int"
-            elif callee == "vec_get":
-                out.append(f"  int64_t {instr.result} = daisy_vec_get({args[0]}, {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "vec_release":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append(f"  daisy_vec_release({args[0]});")
-            elif callee == "str_len":
-                out.append(f"  int64_t {instr.result} = daisy_str_len({args[0]});")
-                var_types[instr.result] = "int"
-            elif callee == "str_char_at":
-                out.append(f"  int64_t {instr.result} = daisy_str_char_at({args[0]}, {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "str_find_char":
-                out.append(f"  int64_t {instr.result} = daisy_str_find_char({args[0]}, {args[1]}, {args[2]});")
-                var_types[instr.result] = "int"
-            elif callee == "str_starts_with":
-                out.append(f"  int64_t {instr.result} = daisy_str_starts_with({args[0]}, {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "str_to_int":
-                out.append(f"  int64_t {instr.result} = daisy_str_to_int({args[0]});")
-                var_types[instr.result] = "int"
-            elif callee == "str_substr":
-                out.append(f"  const char* {instr.result} = daisy_str_substr({args[0]}, {args[1]}, {args[2]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "str_trim":
-                out.append(f"  const char* {instr.result} = daisy_str_trim({args[0]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "str_escape_json":
-                out.append(f"  const char* {instr.result} = daisy_str_escape_json({args[0]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "str_concat":
-                out.append(f"  const char* {instr.result} = daisy_str_concat({args[0]}, {args[1]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "str_release":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append(f"  daisy_str_release({args[0]});")
-                if args and args[0] in owned_types:
-                    released[args[0]] = True
-                    del owned_types[args[0]]
-            elif callee == "int_to_str":
-                out.append(f"  const char* {instr.result} = daisy_int_to_str({args[0]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "file_read":
-                out.append(f"  const char* {instr.result} = daisy_file_read({args[0]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "file_write":
-                out.append(f"  int64_t {instr.result} = daisy_file_write({args[0]}, {args[1]});")
-                var_types[instr.result] = "int"
-            elif callee == "module_load":
-                out.append(f"  const char* {instr.result} = daisy_module_load({args[0]});")
-                var_types[instr.result] = "string"
-                owned_types[instr.result] = "string"
-            elif callee == "error_last":
-                out.append(f"  const char* {instr.result} = daisy_error_last();")
-                var_types[instr.result] = "string"
-            elif callee == "error_clear":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append("  daisy_error_clear();")
-            elif callee == "panic":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append(f"  daisy_panic({args[0]});")
-            elif callee == "channel":
-                out.append(f"  DaisyChannel* {instr.result} = daisy_channel_create();")
-                var_types[instr.result] = "channel"
-                owned_types[instr.result] = "channel"
-            elif callee == "send":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append(f"  daisy_channel_send({args[0]}, {args[1]});")
-            elif callee == "recv":
-                out.append(f"  int64_t {instr.result} = daisy_channel_recv({args[0]});")
-                var_types[instr.result] = "int"
-            elif callee == "channel_close":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                out.append(f"  daisy_channel_close({args[0]});")
-            elif callee == "spawn":
-                if instr.result:
-                    out.append(f"  int64_t {instr.result} = 0;")
-                    var_types[instr.result] = "int"
-                if len(args) == 1:
-                    out.append(f"  daisy_spawn((void*){abi.mangle(self.module_name, args[0])});")
-                elif len(args) == 2:
-                    out.append(f"  daisy_spawn_with_channel((void*){abi.mangle(self.module_name, args[0])}, {args[1]});")
-            else:
-                if "." in callee:
-                    mod_name, fn_name = callee.split(".", 1)
-                    call_name = abi.mangle(mod_name, fn_name)
-                else:
-                    call_name = callee if callee in self.externs else abi.mangle(self.module_name, callee)
-                return_type = self.function_return_types.get(callee) or self.extern_return_types.get(callee)
-                if return_type is None and "." in callee:
-                    return_type = self.extern_signatures.get(callee, (None, [], None))[2]
-                c_type = self._map_type(return_type) if return_type else "int64_t"
-                out.append(f"  {c_type} {instr.result} = {call_name}({', '.join(args)});")
-                if return_type:
-                    var_types[instr.result] = return_type
-                    if return_type in ("string", "buffer", "tensor", "channel", "vec"):
-                        owned_types[instr.result] = return_type
-                else:
-                    var_types[instr.result] = "int"
-        elif instr.op == "borrow":
-            out.append(f"  DaisyView {instr.result} = daisy_view_borrow({instr.args[0]}, {instr.args[1]});")
-            var_types[instr.result] = "view"
-        elif instr.op == "enum_tag":
-            out.append(f"  int64_t {instr.result} = {instr.args[0]}.tag;")
-            var_types[instr.result] = "int"
-        elif instr.op == "loop_begin":
-            out.append(f"  while ({instr.args[0]} < {instr.args[1]}) {{")
-        elif instr.op == "inc":
-            out.append(f"  {instr.args[0]} += 1;")
-        elif instr.op == "loop_end":
-            out.append("  }")
-        elif instr.op == "if_begin":
-            out.append(f"  if ({instr.args[0]}) {{")
-        elif instr.op == "if_else":
-            out.append("  } else {")
-        elif instr.op == "if_end":
-            out.append("  }")
-        elif instr.op == "while_begin":
-            out.append(f"  while ({instr.args[0]}) {{")
-        elif instr.op == "while_end":
-            out.append("  }")
-        elif instr.op == "break":
-            out.append("  break;")
-        elif instr.op == "continue":
-            out.append("  continue;")
+        args: List[str],
+        binop: tuple[str, str, str, Callable[[int, int], int]],
+        out: List[str],
+    ) -> None:
+        before, symbol, after, fold = binop
+        operands = self._const_operands(args)
+        if operands is not None:
+            left, right = operands
+            if self._emit_folded(instr, int(fold(left, right)), out):
+                return
+        result = instr.result
+        out.append(f"  int64_t {result}{before}{args[0]}{symbol}{args[1]}{after}")
+        self.var_types[result] = "int"
+
+    def _call_tensor_matmul(self, instr: ir.Instr, args: List[str], out: List[str]) -> None:
+        if len(args) == 0:
+            out.append(f"  DaisyTensor {instr.result} = daisy_tensor_create(1, 1);")
+        elif len(args) == 2:
+            out.append(f"  DaisyTensor {instr.result} = daisy_tensor_matmul({', '.join(args)});")
         else:
-            raise RuntimeError(f"Unsupported IR op: {instr.op}")
-        return out
+            raise RuntimeError("tensor_matmul expects 0 or 2 args")
+        self.var_types[instr.result] = "tensor"
+        self.owned_types[instr.result] = "tensor"
+
+    def _call_str_release(self, instr: ir.Instr, args: List[str], out: List[str]) -> None:
+        self._bind_unit_result(instr, out)
+        out.append(f"  daisy_str_release({args[0]});")
+        if args and args[0] in self.owned_types:
+            self.released.add(args[0])
+            del self.owned_types[args[0]]
+
+    def _call_spawn(self, instr: ir.Instr, args: List[str], out: List[str]) -> None:
+        self._bind_unit_result(instr, out)
+        if len(args) == 1:
+            out.append(f"  daisy_spawn((void*){self._mangled(self.module_name, args[0])});")
+        elif len(args) == 2:
+            out.append(f"  daisy_spawn_with_channel((void*){self._mangled(self.module_name, args[0])}, {args[1]});")
+
+    def _emit_user_call(self, instr: ir.Instr, callee: str, args: List[str], out: List[str]) -> None:
+        if "." in callee:
+            mod_name, fn_name = callee.split(".", 1)
+            call_name = self._mangled(mod_name, fn_name)
+        else:
+            call_name = callee if callee in self.externs else self._mangled(self.module_name, callee)
+        return_type = self.function_return_types.get(callee) or self.extern_return_types.get(callee)
+        if return_type is None and "." in callee:
+            return_type = self.extern_signatures.get(callee, (None, [], None))[2]
+        c_type = self._map_type(return_type) if return_type else "int64_t"
+        result = instr.result
+        out.append(f"  {c_type} {result} = {call_name}({', '.join(args)});")
+        if return_type:
+            self.var_types[result] = return_type
+            if return_type in ("string", "buffer", "tensor", "channel", "vec"):
+                self.owned_types[result] = return_type
+        else:
+            self.var_types[result] = "int"
+
+    def _emit_borrow(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(f"  DaisyView {instr.result} = daisy_view_borrow({instr.args[0]}, {instr.args[1]});")
+        self.var_types[instr.result] = "view"
+
+    def _emit_enum_tag(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(f"  int64_t {instr.result} = {instr.args[0]}.tag;")
+        self.var_types[instr.result] = "int"
+
+    def _emit_loop_begin(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(f"  while ({instr.args[0]} < {instr.args[1]}) {{")
+
+    def _emit_inc(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(f"  {instr.args[0]} += 1;")
+
+    def _emit_if_begin(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(f"  if ({instr.args[0]}) {{")
+
+    def _emit_if_else(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append("  } else {")
+
+    def _emit_while_begin(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append(f"  while ({instr.args[0]}) {{")
+
+    def _emit_block_end(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append("  }")
+
+    def _emit_break(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append("  break;")
+
+    def _emit_continue(self, instr: ir.Instr, out: List[str]) -> None:
+        out.append("  continue;")
 
     def _map_type(self, name: str) -> str:
+        c_type = self._map_type_cache.get(name)
+        if c_type is None:
+            c_type = self._map_type_cache[name] = self._resolve_c_type(name)
+        return c_type
+
+    def _resolve_c_type(self, name: str) -> str:
         if name in self.structs:
             return self._struct_type_name(name)
         if name in self.enums:
@@ -487,47 +641,41 @@ class CCodegen:
         return "int64_t"
 
     def _struct_field_type(self, struct_name: str | None, field: str) -> Optional[str]:
-        if not struct_name or struct_name not in self.structs:
+        if not struct_name:
+            return None
+        fields = self._struct_fields.get(struct_name)
+        if fields is None:
             return None
-        for f in self.structs[struct_name].fields:
-            if f.name == field:
-                return f.type_name
-        return None
+        return fields.get(field)
 
     def _enum_case_index(self, enum_name: str, case_name: str) -> int:
-        enum = self.enums.get(enum_name)
-        if not enum:
+        cases = self._enum_cases.get(enum_name)
+        if not cases:
             return 0
-        for idx, case in enumerate(enum.cases):
-            if case.name == case_name:
-                return idx
-        return 0
+        case = cases.get(case_name)
+        return case[0] if case else 0
 
     def _enum_case_payload_type(self, enum_name: Optional[str], case_name: str) -> Optional[str]:
         if not enum_name:
             return None
-        enum = self.enums.get(enum_name)
-        if not enum:
+        cases = self._enum_cases.get(enum_name)
+        if not cases:
             return None
-        for case in enum.cases:
-            if case.name == case_name:
-                return case.payload
-        return None
+        case = cases.get(case_name)
+        return case[1] if case else None
 
     def _emit_cleanup(
         self,
+        out: List[str],
         owned_types: Dict[str, str],
-        released: Dict[str, bool],
-        escaped: Dict[str, bool],
-    ) -> List[str]:
-        out: List[str] = []
-        for name, t in list(owned_types.items()):
-            if released.get(name):
-                continue
-            if escaped.get(name):
+        released: set[str],
+        escaped: set[str],
+    ) -> None:
+        for name, t in owned_types.items():
+            if name in released or name in escaped:
                 continue
             if t == "buffer_stack":
-                released[name] = True
+                released.add(name)
                 continue
             if t == "buffer":
                 out.append(f"  daisy_buffer_release(&{name});")
@@ -539,11 +687,54 @@ class CCodegen:
                 out.append(f"  daisy_str_release({name});")
             elif t == "vec":
                 out.append(f"  daisy_vec_release({name});")
-            released[name] = True
-        return out
+            released.add(name)
+
+    _OP_HANDLERS: Dict[str, Callable[["CCodegen", ir.Instr, List[str]], None]] = {
+        "const": _emit_const,
+        "const_str": _emit_const_str,
+        "assign": _emit_assign,
+        "add": _emit_add,
+        "sub": _emit_sub,
+        "mul": _emit_mul,
+        "div": _emit_div,
+        "neg": _emit_neg,
+        "print": _emit_print,
+        "ret": _emit_ret,
+        "buf_create": _emit_buf_create,
+        "buf_borrow": _emit_buf_borrow,
+        "release": _emit_release,
+        "struct_new": _emit_struct_new,
+        "struct_get": _emit_struct_get,
+        "struct_set": _emit_struct_set,
+        "enum_make": _emit_enum_make,
+        "enum_payload": _emit_enum_payload,
+        "call": _emit_call,
+        "borrow": _emit_borrow,
+        "enum_tag": _emit_enum_tag,
+        "loop_begin": _emit_loop_begin,
+        "inc": _emit_inc,
+        "loop_end": _emit_block_end,
+        "if_begin": _emit_if_begin,
+        "if_else": _emit_if_else,
+        "if_end": _emit_block_end,
+        "while_begin": _emit_while_begin,
+        "while_end": _emit_block_end,
+        "break": _emit_break,
+        "continue": _emit_continue,
+    }
+
+    # Intrinsics that need more than a table entry; see _CALL_INTRINSICS.
+    _CALL_HANDLERS: Dict[str, Callable[["CCodegen", ir.Instr, List[str], List[str]], None]] = {
+        "tensor_matmul": _call_tensor_matmul,
+        "str_release": _call_str_release,
+        "spawn": _call_spawn,
+    }
 
 
 def _escape(text: str) -> str:
+    # Most literals need no escaping; str.translate is slower than replace().
+    if "\\" not in text and '"' not in text:
+        return text
     return text.replace("\\", "\\\\").replace('"', '\\"')
 
 
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import contextlib
 import glob
 import hashlib
 import json
 import os
+import pickle
+import shutil
 import subprocess
 import sys
+import tempfile
 import time
 import tomllib
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import IO, Dict, Iterable, List, Optional, Set, Tuple, TypeVar, Union
 
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT / "compiler-core"))
@@ -29,6 +34,14 @@ from compiler_core.diagnostics import format_diagnostic  # noqa: E402
 
 COMPILER_CACHE_REV = "2026-01-29-stdlib-nll-sanitize-14"
 
+_RUNTIME_SOURCES = (ROOT / "runtime" / "rt.c", ROOT / "runtime" / "rt.h")
+
+# Source that modules needing a rebuild must add up to before they compile in
+# worker processes; the passes get through roughly 100 KB/s.
+_COMPILE_POOL_MIN_BYTES = 64 * 1024
+
+_T = TypeVar("_T")
+
 
 @dataclass
 class CompileResult:
@@ -72,100 +85,90 @@ def compile_project(
     profile_data: dict[str, dict[str, float]] = {}
     overall_start = time.perf_counter()
     manifest_path, manifest_data = _load_manifest(entry_path)
-    _check_dependency_versions(manifest_path, manifest_data)
-    _check_dependency_abi(manifest_path, manifest_data)
-    workspace_paths = _workspace_search_paths(manifest_path, manifest_data)
-    search_paths = _dependency_search_paths(manifest_path, manifest_data) + workspace_paths
-    sources = _load_project(entry_path, search_paths)
-    sigs = _collect_signatures(sources)
-    generic_funcs = _collect_generic_funcs(sources)
-    type_defs = _collect_type_defs(sources)
+    dependency_paths = _scan_dependencies(manifest_path, manifest_data)
+    search_paths = dependency_paths + _workspace_search_paths(manifest_path, manifest_data)
+    sources, source_bytes = _load_project(entry_path, search_paths, cache_dir=build_dir / ".cache")
+    sigs, generic_funcs, type_map, struct_map, enum_map = _collect_module_exports(sources)
+    # Every module sees all public symbols except its own; group the own
+    # names once so each view is a copy minus a few keys.
+    own_sigs = _names_by_module(sigs)
+    own_generic_funcs = _names_by_module(generic_funcs)
+    own_types = _names_by_module(type_map)
     c_paths: List[Path] = []
     exe_name = sources[entry_path].name
     module_map = {module.name: path for path, module in sources.items()}
-    module_sources = {module.name: path.read_text(encoding="utf-8") for path, module in sources.items()}
+    module_sources = {module.name: source_bytes[path] for path, module in sources.items()}
     dep_graph = _module_dep_graph(sources, module_map)
     combined_hashes = _combined_module_hashes(module_sources, dep_graph)
 
-    def compile_one(path: Path, module: ast.Module) -> tuple[Path, dict[str, float]]:
-        timings: dict[str, float] = {}
-        source = module_sources[module.name]
-        ext_sigs = _external_sigs_for_module(module.name, sigs)
-        t0 = time.perf_counter()
-        ext_types, ext_structs, ext_enums = _external_types_for_module(module.name, type_defs)
-        ext_generic_funcs = _external_generic_funcs_for_module(module.name, generic_funcs)
-        checker = typecheck.TypeChecker(
-            external_sigs=ext_sigs,
-            external_types=ext_types,
-            external_structs=ext_structs,
-            external_enums=ext_enums,
-            external_generic_funcs=ext_generic_funcs,
-        )
-        type_info = checker.check_module(module)
-        timings["typecheck"] = time.perf_counter() - t0
-        if checker.errors:
-            raise RuntimeError("\n".join(format_diagnostic(e, source) for e in checker.errors))
-        if checker.impl_functions or checker.specialized_functions:
-            module = ast.Module(
-                name=module.name,
-                body=module.body + checker.impl_functions + checker.specialized_functions,
-                span=module.span,
+    results: List[Optional[tuple[Path, dict[str, float]]]] = [None] * len(sources)
+    obj_paths: List[Optional[Path]] = [None] * len(sources)
+    cc = _find_cc()
+    # gcc and clang compile each module to an object as soon as its C is
+    # ready, overlapping the front end of the remaining modules; MSVC still
+    # builds everything in one invocation once the front end is done.
+    objects = _ObjectBuilder(cc, _cc_flags(lto, rt_checks, sanitize)) if cc in ("clang", "gcc") else None
+
+    def module_done(idx: int, result: tuple[Path, dict[str, float]]) -> None:
+        results[idx] = result
+        if objects is not None:
+            obj_paths[idx] = objects.submit(result[0])
+
+    with objects or contextlib.nullcontext():
+        if objects is not None:
+            (build_dir / ".cache").mkdir(parents=True, exist_ok=True)
+            rt_obj, rt_building = _runtime_object(objects, build_dir / ".cache")
+        jobs = []
+        for idx, module in enumerate(sources.values()):
+            source = module_sources[module.name]
+            module_hash = combined_hashes.get(module.name) or _module_hash(source)
+            # The combined hash covers this module and everything it imports, so
+            # an up-to-date module needs none of the passes below.
+            cached_c_path = _cached_c_path(build_dir, module.name, module_hash)
+            if cached_c_path is not None:
+                module_done(idx, (cached_c_path, {}))
+                continue
+            module_types = own_types.get(module.name, [])
+            job = (
+                module,
+                source,
+                _without_names(sigs, own_sigs.get(module.name, [])),
+                _without_names(type_map, module_types),
+                _without_names(struct_map, module_types),
+                _without_names(enum_map, module_types),
+                _without_names(generic_funcs, own_generic_funcs.get(module.name, [])),
+                module_hash,
+                build_dir,
+                emit_ir,
             )
-        t0 = time.perf_counter()
-        borrow = borrowcheck.BorrowChecker(type_info)
-        borrow.check_module(module)
-        timings["borrowcheck"] = time.perf_counter() - t0
-        if borrow.errors:
-            raise RuntimeError("\n".join(format_diagnostic(e, source) for e in borrow.errors))
-        _emit_unsafe_report(module, build_dir)
-        cache = _load_build_cache(build_dir, module.name)
-        module_hash = combined_hashes.get(module.name, _module_hash(source))
-        c_path = build_dir / f"{module.name}.c"
-        abi_path = build_dir / f"{module.name}.abi.json"
-        if cache and cache.get("hash") == module_hash and c_path.exists() and abi_path.exists():
-            return c_path, timings
-        t0 = time.perf_counter()
-        ir_module = irgen.IRGen(
-            struct_defs=checker.struct_defs,
-            enum_defs=checker.enum_defs,
-            expr_types=type_info.expr_types,
-        ).lower_module(module)
-        timings["irgen"] = time.perf_counter() - t0
-        t0 = time.perf_counter()
-        optimized = optimize.Optimizer().run(ir_module)
-        timings["optimize"] = time.perf_counter() - t0
-        _check_abi_compat(optimized, build_dir)
-        ir_validate.validate_module(optimized)
-        extern_map = _extern_signature_map(ext_sigs)
-        t0 = time.perf_counter()
-        c_code = codegen_c.CCodegen().emit(optimized, extern_signatures=extern_map)
-        timings["codegen"] = time.perf_counter() - t0
-        build_dir.mkdir(parents=True, exist_ok=True)
-        c_path.write_text(c_code, encoding="utf-8-sig")
-        if emit_ir:
-            (build_dir / f"{module.name}.ir.txt").write_text(_format_ir(optimized), encoding="utf-8")
-        _emit_abi_manifest(optimized, build_dir)
-        _write_build_cache(build_dir, module.name, module_hash)
-        return c_path, timings
-
-    items = list(sources.items())
-    if len(items) <= 1:
-        for path, module in items:
-            c_path, timings = compile_one(path, module)
+            jobs.append((idx, job))
+        # Every pass holds the GIL, so modules only compile in parallel in
+        # separate processes; results keep source order either way. A pool
+        # costs a process start per worker plus pickling every job, so the
+        # work stays inline unless there is enough source to outweigh that.
+        workers = min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1 or sum(len(job[1]) for _, job in jobs) < _COMPILE_POOL_MIN_BYTES:
+            for idx, job in jobs:
+                module_done(idx, _compile_module(*job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                future_map = {pool.submit(_compile_module, *job): idx for idx, job in jobs}
+                for future in as_completed(future_map):
+                    module_done(future_map[future], future.result())
+        for module, result in zip(sources.values(), results):
+            c_path, timings = result
             c_paths.append(c_path)
             profile_data[module.name] = timings
-    else:
-        workers = max(1, os.cpu_count() or 1)
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            future_map = {pool.submit(compile_one, path, module): module.name for path, module in items}
-            for future in as_completed(future_map):
-                c_path, timings = future.result()
-                c_paths.append(c_path)
-                profile_data[future_map[future]] = timings
-    exe_path = build_dir / exe_name
-    link_start = time.perf_counter()
-    _build_c(c_paths, exe_path, lto=lto, rt_checks=rt_checks, sanitize=sanitize, link_libs=link_libs)
-    link_time = time.perf_counter() - link_start
+        exe_path = build_dir / exe_name
+        link_start = time.perf_counter()
+        if objects is not None:
+            objects.finish()
+            if rt_building is not None:
+                os.replace(rt_building, rt_obj)
+            _link(cc, [*obj_paths, rt_obj], exe_path, objects.flags, link_libs)
+        else:
+            _build_c(c_paths, exe_path, lto=lto, rt_checks=rt_checks, sanitize=sanitize, link_libs=link_libs)
+        link_time = time.perf_counter() - link_start
     if profile:
         build_dir.mkdir(parents=True, exist_ok=True)
         payload = {
@@ -177,6 +180,73 @@ def compile_project(
     return CompileResult(c_path=c_paths[0], exe_path=exe_path)
 
 
+def _compile_module(
+    module: ast.Module,
+    source: bytes,
+    ext_sigs: Dict[str, typecheck.FuncSig],
+    ext_types: Dict[str, types.Type],
+    ext_structs: Dict[str, List[tuple[str, types.Type]]],
+    ext_enums: Dict[str, List[tuple[str, Optional[types.Type]]]],
+    ext_generic_funcs: Dict[str, ast.FunctionDef],
+    module_hash: str,
+    build_dir: Path,
+    emit_ir: bool,
+) -> tuple[Path, dict[str, float]]:
+    timings: dict[str, float] = {}
+    t0 = time.perf_counter()
+    checker = typecheck.TypeChecker(
+        external_sigs=ext_sigs,
+        external_types=ext_types,
+        external_structs=ext_structs,
+        external_enums=ext_enums,
+        external_generic_funcs=ext_generic_funcs,
+    )
+    type_info = checker.check_module(module)
+    timings["typecheck"] = time.perf_counter() - t0
+    if checker.errors:
+        text = _source_text(source)
+        raise RuntimeError("\n".join(format_diagnostic(e, text) for e in checker.errors))
+    if checker.impl_functions or checker.specialized_functions:
+        # The parsed module is shared with the caller, so extend a copy.
+        body = list(module.body)
+        body.extend(checker.impl_functions)
+        body.extend(checker.specialized_functions)
+        module = ast.Module(name=module.name, body=body, span=module.span)
+    t0 = time.perf_counter()
+    borrow = borrowcheck.BorrowChecker(type_info)
+    borrow.check_module(module)
+    timings["borrowcheck"] = time.perf_counter() - t0
+    if borrow.errors:
+        text = _source_text(source)
+        raise RuntimeError("\n".join(format_diagnostic(e, text) for e in borrow.errors))
+    _emit_unsafe_report(module, build_dir)
+    c_path = build_dir / f"{module.name}.c"
+    t0 = time.perf_counter()
+    ir_module = irgen.IRGen(
+        struct_defs=checker.struct_defs,
+        enum_defs=checker.enum_defs,
+        expr_types=type_info.expr_types,
+    ).lower_module(module)
+    timings["irgen"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    optimized = optimize.Optimizer().run(ir_module)
+    timings["optimize"] = time.perf_counter() - t0
+    abi_entries = _abi_entries(optimized)
+    _check_abi_compat(optimized, build_dir, abi_entries)
+    ir_validate.validate_module(optimized)
+    extern_map = _extern_signature_map(ext_sigs)
+    t0 = time.perf_counter()
+    c_code = codegen_c.CCodegen().emit(optimized, extern_signatures=extern_map)
+    timings["codegen"] = time.perf_counter() - t0
+    build_dir.mkdir(parents=True, exist_ok=True)
+    _write_if_changed(c_path, ("\ufeff" + c_code).encode("utf-8"))
+    if emit_ir:
+        (build_dir / f"{module.name}.ir.txt").write_text(_format_ir(optimized), encoding="utf-8")
+    _emit_abi_manifest(optimized, build_dir, abi_entries)
+    _write_build_cache(build_dir, module.name, module_hash)
+    return c_path, timings
+
+
 def _build_c(
     c_paths: List[Path],
     exe_path: Path,
@@ -193,6 +263,7 @@ def _build_c(
         )
     rt_c = ROOT / "runtime" / "rt.c"
     if cc == "cl":
+        rsp_path = _write_response_file(exe_path.parent, [*c_paths, rt_c], msvc=True)
         cmd = [
             "cl",
             "/nologo",
@@ -201,8 +272,7 @@ def _build_c(
             f"/I{ROOT / 'runtime'}",
             "/DDAISY_RT_CHECKS" if rt_checks else "",
             "/fsanitize=address" if sanitize else "",
-            *[str(p) for p in c_paths],
-            str(rt_c),
+            f"@{rsp_path}",
             f"/Fe:{exe_path}.exe",
         ]
         cmd = [c for c in cmd if c]
@@ -210,13 +280,17 @@ def _build_c(
             cmd += [str(lib) for lib in link_libs]
         if sys.platform == "win32":
             cmd.append("ws2_32.lib")
-        subprocess.check_call(cmd)
+        try:
+            _run_tool(cmd)
+        finally:
+            rsp_path.unlink()
         return
     if cc == "msvc":
         vcvars = _find_vcvarsall()
         if not vcvars:
             raise RuntimeError("MSVC found but vcvarsall.bat not located")
         vcvars = vcvars.strip('"')
+        rsp_path = _write_response_file(exe_path.parent, [*c_paths, rt_c], msvc=True)
         cl_cmd = [
             "cl",
             "/nologo",
@@ -226,8 +300,7 @@ def _build_c(
             f"/I{ROOT / 'runtime'}",
             "/DDAISY_RT_CHECKS" if rt_checks else "",
             "/fsanitize=address" if sanitize else "",
-            *[str(p) for p in c_paths],
-            str(rt_c),
+            f"@{rsp_path}",
             f"/Fe:{exe_path}.exe",
         ]
         cl_cmd = [c for c in cl_cmd if c]
@@ -236,8 +309,13 @@ def _build_c(
         if sys.platform == "win32":
             cl_cmd.append("ws2_32.lib")
         cmd_str = f'call "{vcvars}" x64 && ' + " ".join(cl_cmd)
-        subprocess.check_call(cmd_str, shell=True)
-        return
+        try:
+            _run_tool(cmd_str, shell=True)
+        finally:
+            rsp_path.unlink()
+
+
+def _cc_flags(lto: bool, rt_checks: bool, sanitize: Optional[str]) -> List[str]:
     flags: List[str] = ["-std=c11", "-O2"]
     if lto:
         flags.append("-flto")
@@ -247,64 +325,185 @@ def _build_c(
         flags.append(f"-fsanitize={sanitize}")
         flags.append("-fno-omit-frame-pointer")
         flags.append("-g")
-    cmd = [cc, *[str(p) for p in c_paths], str(rt_c), "-o", str(exe_path), "-I", str(ROOT / "runtime")] + flags
+    return flags
+
+
+def _link(cc: str, obj_paths: List[Path], exe_path: Path, flags: List[str], link_libs: Optional[List[Path]]) -> None:
+    # Inputs go through a response file so wide projects stay clear of argv limits.
+    rsp_path = _write_response_file(exe_path.parent, obj_paths, msvc=False)
+    cmd = [cc, f"@{rsp_path}", "-o", str(exe_path)] + flags
     if link_libs:
         for lib in link_libs:
             cmd.append(str(lib))
     if sys.platform == "win32":
         cmd.append("-lws2_32")
-    subprocess.check_call(cmd)
+    try:
+        _run_tool(cmd)
+    finally:
+        rsp_path.unlink()
 
 
-def _collect_signatures(modules: Dict[Path, "ast.Module"]) -> Dict[str, typecheck.FuncSig]:
-    sigs: Dict[str, typecheck.FuncSig] = {}
-    resolver = typecheck.TypeChecker()
-    for module in modules.values():
-        for stmt in module.body:
-            if isinstance(stmt, ast.FunctionDef):
-                if not stmt.is_public:
-                    continue
-                params = [resolver._resolve_type(p.type_ref) for p in stmt.params]
-                sigs[f"{module.name}.{stmt.name}"] = typecheck.FuncSig(
-                    params=params,
-                    returns=resolver._resolve_type(stmt.return_type),
-                )
-            elif isinstance(stmt, ast.ExternFunctionDef):
-                if not stmt.is_public:
-                    continue
-                params = [resolver._resolve_type(p.type_ref) for p in stmt.params]
-                sigs[f"{module.name}.{stmt.name}"] = typecheck.FuncSig(
-                    params=params,
-                    returns=resolver._resolve_type(stmt.return_type),
-                )
-    return sigs
+def _tool_env() -> Dict[str, str]:
+    # Untranslated diagnostics; compilers skip loading message catalogs.
+    return {**os.environ, "LC_ALL": "C"}
 
 
-def _collect_generic_funcs(modules: Dict[Path, "ast.Module"]) -> Dict[str, ast.FunctionDef]:
-    funcs: Dict[str, ast.FunctionDef] = {}
-    for module in modules.values():
-        for stmt in module.body:
-            if isinstance(stmt, ast.FunctionDef) and stmt.type_params:
-                funcs[f"{module.name}.{stmt.name}"] = stmt
-    return funcs
+def _run_tool(cmd: Union[List[str], str], shell: bool = False) -> None:
+    result = subprocess.run(cmd, shell=shell, stdin=subprocess.DEVNULL, capture_output=True, env=_tool_env())
+    if result.returncode:
+        # cl reports errors on stdout, gcc and clang on stderr; echo both.
+        _report_tool_output(result.stdout + result.stderr)
+        raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+
 
+def _report_tool_output(output: bytes) -> None:
+    sys.stderr.flush()
+    sys.stderr.buffer.write(output)
+    sys.stderr.buffer.flush()
+
+
+def _write_response_file(rsp_dir: Path, paths: List[Path], msvc: bool) -> Path:
+    if msvc:
+        # cl reads UTF-16 response files; quotes are enough, backslashes are literal.
+        data = ("\n".join(f'"{p}"' for p in paths) + "\n").encode("utf-16")
+    else:
+        # gcc and clang treat backslash as an escape character even inside quotes.
+        quoted = ('"' + str(p).replace("\\", "\\\\").replace('"', '\\"') + '"' for p in paths)
+        data = ("\n".join(quoted) + "\n").encode("utf-8")
+    # A fresh file per link: builds sharing a dir must not swap each other's
+    # inputs between writing the file and the compiler reading it.
+    with tempfile.NamedTemporaryFile(dir=rsp_dir, suffix=".rsp", delete=False) as rsp:
+        rsp.write(data)
+    return Path(rsp.name)
+
+
+class _ObjectBuilder:
+    # Runs `cc -c` for each submitted C file in the background, at most one
+    # compiler per CPU, so the caller can keep working until it links.
+    def __init__(self, cc: str, flags: List[str]) -> None:
+        self.cc = cc
+        self.flags = flags
+        self.limit = os.cpu_count() or 1
+        self.running: List[Tuple[subprocess.Popen, List[str], IO[bytes]]] = []
+        # Private outputs the caller moves into place; whatever is left on exit is stale.
+        self.scratch: List[Path] = []
+
+    def __enter__(self) -> "_ObjectBuilder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        # Anything still running here is orphaned by an error; stop it.
+        for proc, _, log in self.running:
+            proc.kill()
+            proc.wait()
+            log.close()
+        self.running = []
+        for path in self.scratch:
+            path.unlink(missing_ok=True)
+
+    def submit(self, c_path: Path, obj_path: Optional[Path] = None) -> Path:
+        if obj_path is None:
+            obj_path = c_path.with_suffix(".o")
+        cmd = [self.cc, "-c", str(c_path), "-o", str(obj_path), "-I", str(ROOT / "runtime")] + self.flags
+        while len(self.running) >= self.limit:
+            self._wait_oldest()
+        # Output goes to a temp file rather than a pipe so a chatty compiler
+        # never blocks while nobody is reading; it is shown only on failure.
+        log = tempfile.TemporaryFile()
+        proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, env=_tool_env())
+        self.running.append((proc, cmd, log))
+        return obj_path
+
+    def finish(self) -> None:
+        while self.running:
+            self._wait_oldest()
+
+    def _wait_oldest(self) -> None:
+        proc, cmd, log = self.running.pop(0)
+        with log:
+            if proc.wait():
+                log.seek(0)
+                output = log.read()
+                _report_tool_output(output)
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output)
+
+
+def _runtime_object(objects: _ObjectBuilder, cache_dir: Path) -> Tuple[Path, Optional[Path]]:
+    # One runtime object per compiler binary and flag set, shared by every
+    # build into this dir. When it is stale this returns the private path it
+    # is being compiled to; the caller moves that into place once it is
+    # complete, so a concurrent build never links a half-written object.
+    key = hashlib.sha256("\0".join([_compiler_identity(objects.cc), *objects.flags]).encode("utf-8")).hexdigest()[:16]
+    obj_path = cache_dir / f"rt-{key}.o"
+    try:
+        if obj_path.stat().st_mtime_ns >= max(src.stat().st_mtime_ns for src in _RUNTIME_SOURCES):
+            return obj_path, None
+    except OSError:
+        pass
+    building = objects.submit(_RUNTIME_SOURCES[0], cache_dir / f"rt-{key}.{os.getpid()}.o")
+    objects.scratch.append(building)
+    return obj_path, building
+
+
+def _compiler_identity(cc: str) -> str:
+    # The installed binary, not just its name: an upgraded toolchain must not
+    # link objects (LTO bytecode in particular) built by the previous one.
+    path = _which(cc)
+    if path is None:
+        return cc
+    real_path = os.path.realpath(path)
+    try:
+        stat = os.stat(real_path)
+    except OSError:
+        return real_path
+    return f"{real_path}\0{stat.st_mtime_ns}\0{stat.st_size}"
 
-def _collect_type_defs(
+
+def _collect_module_exports(
     modules: Dict[Path, "ast.Module"],
-) -> Tuple[Dict[str, types.Type], Dict[str, List[tuple[str, types.Type]]], Dict[str, List[tuple[str, Optional[types.Type]]]]]:
+) -> Tuple[
+    Dict[str, typecheck.FuncSig],
+    Dict[str, ast.FunctionDef],
+    Dict[str, types.Type],
+    Dict[str, List[tuple[str, types.Type]]],
+    Dict[str, List[tuple[str, Optional[types.Type]]]],
+]:
+    sigs: Dict[str, typecheck.FuncSig] = {}
+    generic_funcs: Dict[str, ast.FunctionDef] = {}
     type_map: Dict[str, types.Type] = {}
     struct_map: Dict[str, List[tuple[str, types.Type]]] = {}
     enum_map: Dict[str, List[tuple[str, Optional[types.Type]]]] = {}
     resolver = typecheck.TypeChecker()
+    # A fresh checker resolves a plain type name the same way every time, so
+    # each name is resolved once; generic refs go through the checker.
+    resolved: Dict[str, types.Type] = {}
+
+    def resolve(type_ref: ast.TypeRef) -> types.Type:
+        if type_ref.args:
+            return resolver._resolve_type(type_ref)
+        t = resolved.get(type_ref.name)
+        if t is None:
+            t = resolved[type_ref.name] = resolver._resolve_type(type_ref)
+        return t
+
     for module in modules.values():
         for stmt in module.body:
-            if isinstance(stmt, ast.StructDef):
+            if isinstance(stmt, (ast.FunctionDef, ast.ExternFunctionDef)):
+                if isinstance(stmt, ast.FunctionDef) and stmt.type_params:
+                    generic_funcs[f"{module.name}.{stmt.name}"] = stmt
+                if not stmt.is_public:
+                    continue
+                sigs[f"{module.name}.{stmt.name}"] = typecheck.FuncSig(
+                    params=[resolve(p.type_ref) for p in stmt.params],
+                    returns=resolve(stmt.return_type),
+                )
+            elif isinstance(stmt, ast.StructDef):
                 if not stmt.is_public:
                     continue
                 fields: List[tuple[str, types.Type]] = []
                 is_copy = True
                 for field in stmt.fields:
-                    t = resolver._resolve_type(field.type_ref)
+                    t = resolve(field.type_ref)
                     fields.append((field.name, t))
                     if not t.is_copy:
                         is_copy = False
@@ -315,54 +514,25 @@ def _collect_type_defs(
                     continue
                 cases: List[tuple[str, Optional[types.Type]]] = []
                 for case in stmt.cases:
-                    payload = resolver._resolve_type(case.payload) if case.payload else None
+                    payload = resolve(case.payload) if case.payload else None
                     cases.append((case.name, payload))
                 type_map[f"{module.name}.{stmt.name}"] = types.Type(name=stmt.name, is_copy=False)
                 enum_map[f"{module.name}.{stmt.name}"] = cases
-    return type_map, struct_map, enum_map
-
-
-def _external_types_for_module(
-    module_name: str,
-    type_defs: Tuple[
-        Dict[str, types.Type],
-        Dict[str, List[tuple[str, types.Type]]],
-        Dict[str, List[tuple[str, Optional[types.Type]]]],
-    ],
-) -> Tuple[Dict[str, types.Type], Dict[str, List[tuple[str, types.Type]]], Dict[str, List[tuple[str, Optional[types.Type]]]]]:
-    type_map, struct_map, enum_map = type_defs
-    ext_types: Dict[str, types.Type] = {}
-    ext_structs: Dict[str, List[tuple[str, types.Type]]] = {}
-    ext_enums: Dict[str, List[tuple[str, Optional[types.Type]]]] = {}
-    for name, t in type_map.items():
-        if not name.startswith(f"{module_name}."):
-            ext_types[name] = t
-    for name, fields in struct_map.items():
-        if not name.startswith(f"{module_name}."):
-            ext_structs[name] = fields
-    for name, cases in enum_map.items():
-        if not name.startswith(f"{module_name}."):
-            ext_enums[name] = cases
-    return ext_types, ext_structs, ext_enums
-
-
-def _external_sigs_for_module(module_name: str, sigs: Dict[str, typecheck.FuncSig]) -> Dict[str, typecheck.FuncSig]:
-    externals: Dict[str, typecheck.FuncSig] = {}
-    for name, sig in sigs.items():
-        if not name.startswith(f"{module_name}."):
-            externals[name] = sig
-    return externals
+    return sigs, generic_funcs, type_map, struct_map, enum_map
+
+
+def _names_by_module(symbols: Iterable[str]) -> Dict[str, List[str]]:
+    names: Dict[str, List[str]] = {}
+    for name in symbols:
+        names.setdefault(name.split(".", 1)[0], []).append(name)
+    return names
 
 
-def _external_generic_funcs_for_module(
-    module_name: str,
-    funcs: Dict[str, ast.FunctionDef],
-) -> Dict[str, ast.FunctionDef]:
-    externals: Dict[str, ast.FunctionDef] = {}
-    for name, func in funcs.items():
-        if not name.startswith(f"{module_name}."):
-            externals[name] = func
-    return externals
+def _without_names(symbols: Dict[str, _T], names: List[str]) -> Dict[str, _T]:
+    remaining = dict(symbols)
+    for name in names:
+        remaining.pop(name, None)
+    return remaining
 
 
 def _extern_signature_map(sigs: Dict[str, typecheck.FuncSig]) -> Dict[str, Tuple[str, List[str], str]]:
@@ -374,25 +544,146 @@ def _extern_signature_map(sigs: Dict[str, typecheck.FuncSig]) -> Dict[str, Tuple
     return extern_map
 
 
-def _load_project(entry_path: Path, search_paths: Optional[List[Path]] = None) -> Dict[Path, "ast.Module"]:
+def _load_project(
+    entry_path: Path,
+    search_paths: Optional[List[Path]] = None,
+    cache_dir: Optional[Path] = None,
+) -> tuple[Dict[Path, "ast.Module"], Dict[Path, bytes]]:
     entry_path = entry_path.resolve()
+    parsed = _parse_project_parallel(entry_path, search_paths or [], cache_dir)
     modules: Dict[Path, "ast.Module"] = {}
+    sources: Dict[Path, bytes] = {}
     name_to_path: Dict[str, Path] = {}
     stack: List[Path] = [entry_path]
+    # Same walk as a sequential load, so module order and the first error
+    # reported do not depend on which parse finished first.
     while stack:
         path = stack.pop()
         if path in modules:
             continue
-        source = path.read_text(encoding="utf-8")
-        module = parser.parse(source)
+        source, module = parsed[path] if path in parsed else _parse_source(path, cache_dir)
         modules[path] = module
+        sources[path] = source
         name_to_path[module.name] = path
         for stmt in module.body:
             if isinstance(stmt, ast.Import):
                 import_path = _resolve_module_path(stmt.module, path.parent, search_paths or [])
                 if import_path not in modules:
                     stack.append(import_path)
-    return modules
+    return modules, sources
+
+
+# A missing entry, or one pickled from AST classes that have since changed.
+_AST_CACHE_ERRORS = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError)
+
+# Uncached source that has to be waiting before parsing moves to worker
+# processes. The parser manages roughly 150 KB/s, and a pool costs a process
+# start per worker (plus the compiler imports under spawn) before it parses
+# anything.
+_PARSE_POOL_MIN_BYTES = 64 * 1024
+
+
+def _parse_source(path: Path, cache_dir: Optional[Path] = None) -> tuple[bytes, "ast.Module"]:
+    source = path.read_bytes()
+    if cache_dir is None:
+        return source, parser.parse(_source_text(source))
+    module = _cached_ast(path, source, cache_dir)
+    if module is None:
+        module = parser.parse(_source_text(source))
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Concurrent builds share the cache dir; readers must never see a partial pickle.
+        payload = pickle.dumps((_module_hash(source), module), protocol=pickle.HIGHEST_PROTOCOL)
+        _write_if_changed(_ast_cache_path(path, cache_dir), payload)
+    return source, module
+
+
+def _cached_ast(path: Path, source: bytes, cache_dir: Path) -> Optional["ast.Module"]:
+    # Keyed by path, checked by content: an edited file overwrites its entry.
+    try:
+        cached_hash, module = pickle.loads(_ast_cache_path(path, cache_dir).read_bytes())
+    except _AST_CACHE_ERRORS:
+        return None
+    return module if cached_hash == _module_hash(source) else None
+
+
+def _ast_cache_path(path: Path, cache_dir: Path) -> Path:
+    return cache_dir / f"{hashlib.sha256(str(path).encode('utf-8')).hexdigest()[:32]}.ast.pkl"
+
+
+def _parse_project_parallel(
+    entry_path: Path,
+    search_paths: List[Path],
+    cache_dir: Optional[Path] = None,
+) -> Dict[Path, tuple[bytes, "ast.Module"]]:
+    # Collects every module reachable from the entry. Cached ASTs are taken
+    # in-process; the rest are parsed inline unless enough uncached source is
+    # waiting to pay for a pool of worker processes. Failures are left out;
+    # _load_project parses those again itself and raises in order.
+    workers = os.cpu_count() or 1
+    parsed: Dict[Path, tuple[bytes, "ast.Module"]] = {}
+    seen: Set[Path] = {entry_path}
+    stack: List[Path] = [entry_path]
+    uncached: List[Path] = []
+    uncached_bytes = 0
+    pool: Optional[ProcessPoolExecutor] = None
+    pending = {}
+    try:
+        while True:
+            while stack:
+                path = stack.pop()
+                try:
+                    source = path.read_bytes()
+                except OSError:
+                    continue
+                module = _cached_ast(path, source, cache_dir) if cache_dir is not None else None
+                if module is None:
+                    uncached.append(path)
+                    uncached_bytes += len(source)
+                    continue
+                parsed[path] = (source, module)
+                _queue_imports(path, module, search_paths, seen, stack)
+            if uncached:
+                if pool is None and workers > 1 and uncached_bytes >= _PARSE_POOL_MIN_BYTES:
+                    pool = ProcessPoolExecutor(max_workers=workers)
+                for path in uncached:
+                    if pool is not None:
+                        pending[pool.submit(_parse_source, path, cache_dir)] = path
+                        continue
+                    try:
+                        parsed[path] = _parse_source(path, cache_dir)
+                    except Exception:
+                        continue
+                    _queue_imports(path, parsed[path][1], search_paths, seen, stack)
+                uncached = []
+                uncached_bytes = 0
+                continue
+            if not pending:
+                return parsed
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    parsed[path] = future.result()
+                except Exception:
+                    continue
+                _queue_imports(path, parsed[path][1], search_paths, seen, stack)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _queue_imports(path: Path, module: "ast.Module", search_paths: List[Path], seen: Set[Path], stack: List[Path]) -> None:
+    for stmt in module.body:
+        if not isinstance(stmt, ast.Import):
+            continue
+        try:
+            import_path = _resolve_module_path(stmt.module, path.parent, search_paths)
+        except RuntimeError:
+            # Left for _load_project to report; the remaining imports still count.
+            continue
+        if import_path not in seen:
+            seen.add(import_path)
+            stack.append(import_path)
 
 
 def _resolve_module_path(name: str, base_dir: Path, search_paths: List[Path]) -> Path:
@@ -417,12 +708,25 @@ def _load_manifest(entry_path: Path) -> tuple[Optional[Path], dict]:
     manifest = _find_manifest(entry_path)
     if not manifest:
         return None, {}
-    data = tomllib.loads(manifest.read_text(encoding="utf-8"))
+    data = _read_toml(manifest)
     if not isinstance(data, dict):
         return manifest, {}
     return manifest, data
 
 
+def _read_toml(path: Path) -> object:
+    stat = path.stat()
+    return _parse_toml(path, stat.st_mtime_ns, stat.st_size)
+
+
+# Manifests are re-read by every build; the stat fields in the key make an
+# edited file parse again in long-lived processes.
+@lru_cache(maxsize=64)
+def _parse_toml(path: Path, mtime_ns: int, size: int) -> object:
+    with open(path, "rb") as fp:
+        return tomllib.load(fp)
+
+
 def _find_manifest(entry_path: Path) -> Optional[Path]:
     cur = entry_path if entry_path.is_dir() else entry_path.parent
     while True:
@@ -434,19 +738,23 @@ def _find_manifest(entry_path: Path) -> Optional[Path]:
         cur = cur.parent
 
 
-def _dependency_search_paths(manifest: Optional[Path], data: dict) -> List[Path]:
+def _scan_dependencies(manifest: Optional[Path], data: dict) -> List[Path]:
+    # One pass over [dependencies]: validate each one, then collect its
+    # search paths.
     if not manifest or not data:
         return []
     deps = data.get("dependencies", {})
     if not isinstance(deps, dict):
         return []
     paths: List[Path] = []
-    for _, spec in deps.items():
-        dep_path, _ = _dep_spec_to_path_req(manifest, spec)
+    for dep_name, spec in deps.items():
+        dep_path, version_req = _dep_spec_to_path_req(manifest, spec)
         if dep_path is None:
             continue
         if not dep_path.is_absolute():
             dep_path = (manifest.parent / dep_path).resolve()
+        _check_dependency_version(dep_name, dep_path, version_req)
+        _check_dependency_abi(dep_name, dep_path)
         paths.append(dep_path / "src")
         paths.append(dep_path)
     return paths
@@ -478,9 +786,15 @@ def _workspace_search_paths(manifest: Optional[Path], data: dict) -> List[Path]:
     return paths
 
 
-def _module_hash(source: str) -> str:
-    payload = f"{abi.ABI_VERSION_MAJOR}.{abi.ABI_VERSION_MINOR}\n{COMPILER_CACHE_REV}\n{source}"
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+def _module_hash(source: bytes) -> str:
+    digest = hashlib.sha256(f"{abi.ABI_VERSION_MAJOR}.{abi.ABI_VERSION_MINOR}\n{COMPILER_CACHE_REV}\n".encode("utf-8"))
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def _source_text(source: bytes) -> str:
+    # The text read_text() would give; only needed to render diagnostics.
+    return source.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
 
 
 def _module_dep_graph(
@@ -500,66 +814,100 @@ def _module_dep_graph(
 
 
 def _combined_module_hashes(
-    module_sources: Dict[str, str],
+    module_sources: Dict[str, bytes],
     dep_graph: Dict[str, List[str]],
 ) -> Dict[str, str]:
     base_hashes = {name: _module_hash(src) for name, src in module_sources.items()}
     combined: Dict[str, str] = {}
-
-    def visit(name: str) -> str:
-        if name in combined:
-            return combined[name]
-        deps = dep_graph.get(name, [])
-        dep_hashes = [visit(dep) for dep in deps if dep in base_hashes]
-        payload = base_hashes.get(name, "") + "".join(sorted(dep_hashes))
-        combined[name] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
-        return combined[name]
-
-    for name in base_hashes:
-        visit(name)
+    # Post-order walk with an explicit stack so deep import chains cannot
+    # exhaust the recursion limit; a module is hashed once all of its imports are.
+    for root in base_hashes:
+        if root in combined:
+            continue
+        active = {root}
+        stack = [(root, iter(dep_graph.get(root, [])))]
+        while stack:
+            name, deps = stack[-1]
+            for dep in deps:
+                if dep in base_hashes and dep not in combined:
+                    if dep in active:
+                        raise RuntimeError(f"Import cycle through module {dep}")
+                    active.add(dep)
+                    stack.append((dep, iter(dep_graph.get(dep, []))))
+                    break
+            else:
+                stack.pop()
+                active.discard(name)
+                digest = hashlib.sha256(base_hashes[name].encode("utf-8"))
+                for dep_hash in sorted(combined[dep] for dep in dep_graph.get(name, []) if dep in base_hashes):
+                    digest.update(dep_hash.encode("utf-8"))
+                combined[name] = digest.hexdigest()
     return combined
 
 
 def _load_build_cache(build_dir: Path, module_name: str) -> Optional[dict]:
     cache_path = build_dir / ".cache" / f"{module_name}.json"
-    if not cache_path.exists():
-        return None
     try:
         data = json.loads(cache_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+    except (FileNotFoundError, json.JSONDecodeError):
         return None
     return data if isinstance(data, dict) else None
 
 
+def _cached_c_path(build_dir: Path, module_name: str, module_hash: str) -> Optional[Path]:
+    cache = _load_build_cache(build_dir, module_name)
+    if not cache or cache.get("hash") != module_hash:
+        return None
+    c_path = build_dir / f"{module_name}.c"
+    abi_path = build_dir / f"{module_name}.abi.json"
+    if c_path.exists() and abi_path.exists():
+        return c_path
+    return None
+
+
 def _write_build_cache(build_dir: Path, module_name: str, module_hash: str) -> None:
     cache_dir = build_dir / ".cache"
     cache_dir.mkdir(parents=True, exist_ok=True)
     cache_path = cache_dir / f"{module_name}.json"
-    cache_path.write_text(json.dumps({"hash": module_hash}, indent=2), encoding="utf-8")
+    _write_if_changed(cache_path, json.dumps({"hash": module_hash}, separators=(",", ":")).encode("utf-8"))
+
+
+def _write_if_changed(path: Path, data: bytes) -> None:
+    # Leaves identical files untouched so their mtimes do not trigger
+    # downstream rebuilds; new content lands atomically via a temp file.
+    try:
+        if path.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+# Statements whose body the unsafe report descends into.
+_UNSAFE_SCAN_TYPES = frozenset({ast.UnsafeBlock, ast.FunctionDef, ast.If, ast.Repeat, ast.While})
 
 
 def _emit_unsafe_report(module: ast.Module, build_dir: Path) -> None:
     unsafe_entries: List[str] = []
-
-    def walk_stmts(stmts: List[ast.Stmt]) -> None:
-        for stmt in stmts:
-            if isinstance(stmt, ast.UnsafeBlock):
+    # Pre-order walk over a stack of body iterators; entries keep source order.
+    stack = [iter(module.body)]
+    while stack:
+        for stmt in stack[-1]:
+            kind = type(stmt)
+            if kind not in _UNSAFE_SCAN_TYPES:
+                continue
+            if kind is ast.UnsafeBlock:
                 reason = stmt.reason or "missing"
                 if stmt.span:
                     unsafe_entries.append(f"L{stmt.span.line_start}:{stmt.span.column_start} {reason}")
                 else:
                     unsafe_entries.append(f"L?:? {reason}")
-                walk_stmts(stmt.body)
-            elif isinstance(stmt, ast.FunctionDef):
-                walk_stmts(stmt.body)
-            elif isinstance(stmt, ast.If):
-                walk_stmts(stmt.body)
-            elif isinstance(stmt, ast.Repeat):
-                walk_stmts(stmt.body)
-            elif isinstance(stmt, ast.While):
-                walk_stmts(stmt.body)
-
-    walk_stmts(module.body)
+            stack.append(iter(stmt.body))
+            break
+        else:
+            stack.pop()
     if not unsafe_entries:
         return
     build_dir.mkdir(parents=True, exist_ok=True)
@@ -571,22 +919,26 @@ def _emit_unsafe_report(module: ast.Module, build_dir: Path) -> None:
 
 def _format_ir(ir_module: "ir.IRModule") -> str:
     lines: List[str] = [f"module {ir_module.name}"]
+    append = lines.append
     for ext in ir_module.externs:
         params = ", ".join([f"{p.name}:{p.type_name}" for p in ext.params])
-        lines.append(f"extern {ext.name}({params}) -> {ext.return_type}")
+        append(f"extern {ext.name}({params}) -> {ext.return_type}")
     for func in ir_module.functions:
         params = ", ".join([f"{p.name}:{p.type_name}" for p in func.params])
-        lines.append(f"fn {func.name}({params}) -> {func.return_type}:")
+        append(f"fn {func.name}({params}) -> {func.return_type}:")
         for block in func.blocks:
-            lines.append(f"  block {block.label}:")
+            append(f"  block {block.label}:")
             for instr in block.instructions:
-                args = ", ".join(instr.args)
-                if instr.result:
-                    type_suffix = f":{instr.type_name}" if instr.type_name else ""
-                    lines.append(f"    {instr.result}{type_suffix} = {instr.op} {args}")
+                args = ", ".join(instr.args) if instr.args else ""
+                if not instr.result:
+                    append(f"    {instr.op} {args}")
+                elif instr.type_name:
+                    append(f"    {instr.result}:{instr.type_name} = {instr.op} {args}")
                 else:
-                    lines.append(f"    {instr.op} {args}")
-    return "\n".join(lines) + "\n"
+                    append(f"    {instr.result} = {instr.op} {args}")
+    # Trailing newline via the join itself rather than a second full copy.
+    append("")
+    return "\n".join(lines)
 
 
 def _dep_spec_to_path_req(manifest: Path, spec: object) -> tuple[Optional[Path], Optional[str]]:
@@ -600,66 +952,64 @@ def _dep_spec_to_path_req(manifest: Path, spec: object) -> tuple[Optional[Path],
     return None, None
 
 
-def _check_dependency_versions(manifest: Optional[Path], data: dict) -> None:
-    if not manifest or not data:
-        return
-    deps = data.get("dependencies", {})
-    if not isinstance(deps, dict):
-        return
-    for dep_name, spec in deps.items():
-        dep_path, version_req = _dep_spec_to_path_req(manifest, spec)
-        if dep_path is None:
-            continue
-        if not dep_path.is_absolute():
-            dep_path = (manifest.parent / dep_path).resolve()
-        dep_manifest = dep_path / "daisy.toml"
-        if not dep_manifest.exists():
-            raise RuntimeError(f"Dependency manifest not found: {dep_manifest}")
-        dep_data = tomllib.loads(dep_manifest.read_text(encoding="utf-8"))
-        if not isinstance(dep_data, dict):
-            raise RuntimeError(f"Invalid dependency manifest: {dep_manifest}")
-        dep_pkg = dep_data.get("package", {})
-        if not isinstance(dep_pkg, dict):
-            raise RuntimeError(f"Dependency manifest missing [package]: {dep_manifest}")
-        dep_version = dep_pkg.get("version")
-        dep_pkg_name = dep_pkg.get("name")
-        if isinstance(dep_pkg_name, str) and dep_name != dep_pkg_name:
-            raise RuntimeError(f"Dependency name mismatch: {dep_name} != {dep_pkg_name}")
-        if version_req:
-            if not isinstance(dep_version, str):
-                raise RuntimeError(f"Dependency version missing for {dep_name}")
-            if not _satisfies_version(dep_version, version_req):
-                raise RuntimeError(
-                    f"Dependency version mismatch for {dep_name}: required {version_req}, found {dep_version}"
-                )
+def _check_dependency_version(dep_name: str, dep_path: Path, version_req: Optional[str]) -> None:
+    dep_manifest = dep_path / "daisy.toml"
+    if not dep_manifest.exists():
+        raise RuntimeError(f"Dependency manifest not found: {dep_manifest}")
+    dep_data = _read_toml(dep_manifest)
+    if not isinstance(dep_data, dict):
+        raise RuntimeError(f"Invalid dependency manifest: {dep_manifest}")
+    dep_pkg = dep_data.get("package", {})
+    if not isinstance(dep_pkg, dict):
+        raise RuntimeError(f"Dependency manifest missing [package]: {dep_manifest}")
+    dep_version = dep_pkg.get("version")
+    dep_pkg_name = dep_pkg.get("name")
+    if isinstance(dep_pkg_name, str) and dep_name != dep_pkg_name:
+        raise RuntimeError(f"Dependency name mismatch: {dep_name} != {dep_pkg_name}")
+    if version_req:
+        if not isinstance(dep_version, str):
+            raise RuntimeError(f"Dependency version missing for {dep_name}")
+        if not _satisfies_version(dep_version, version_req):
+            raise RuntimeError(
+                f"Dependency version mismatch for {dep_name}: required {version_req}, found {dep_version}"
+            )
 
 
-def _check_dependency_abi(manifest: Optional[Path], data: dict) -> None:
-    if not manifest or not data:
-        return
-    deps = data.get("dependencies", {})
-    if not isinstance(deps, dict):
+def _check_dependency_abi(dep_name: str, dep_path: Path) -> None:
+    try:
+        entries = list(os.scandir(dep_path / "build"))
+    except FileNotFoundError:
         return
-    for dep_name, spec in deps.items():
-        dep_path, _ = _dep_spec_to_path_req(manifest, spec)
-        if dep_path is None:
+    for entry in entries:
+        if not entry.name.endswith(".abi.json") or entry.name.startswith(".") or not entry.is_file():
             continue
-        if not dep_path.is_absolute():
-            dep_path = (manifest.parent / dep_path).resolve()
-        build_dir = dep_path / "build"
-        if not build_dir.exists():
-            continue
-        for abi_path in build_dir.glob("*.abi.json"):
-            abi_data = json.loads(abi_path.read_text(encoding="utf-8"))
-            abi_version = abi_data.get("abi_version", {"major": abi.ABI_VERSION_MAJOR, "minor": 0})
-            if isinstance(abi_version, int):
-                abi_major = abi_version
-            else:
-                abi_major = abi_version.get("major", 0)
-            if abi_major != abi.ABI_VERSION_MAJOR:
-                raise RuntimeError(
-                    f"Dependency ABI major mismatch for {dep_name}: {abi_major} != {abi.ABI_VERSION_MAJOR}"
-                )
+        abi_version = _read_abi_version(entry.path)
+        if isinstance(abi_version, int):
+            abi_major = abi_version
+        else:
+            abi_major = abi_version.get("major", 0)
+        if abi_major != abi.ABI_VERSION_MAJOR:
+            raise RuntimeError(
+                f"Dependency ABI major mismatch for {dep_name}: {abi_major} != {abi.ABI_VERSION_MAJOR}"
+            )
+
+
+def _read_abi_version(path: str) -> object:
+    with open(path, "rb") as fh:
+        head = fh.read(256)
+        # _emit_abi_manifest writes abi_version right after the module name,
+        # so it normally decodes from the head without parsing the functions.
+        key = head.find(b'"abi_version":')
+        if key >= 0:
+            text = head[key + len(b'"abi_version":') :].decode("utf-8", errors="ignore").lstrip()
+            try:
+                value, end = json.JSONDecoder().raw_decode(text)
+            except json.JSONDecodeError:
+                value, end = None, len(text)
+            if value is not None and end < len(text):
+                return value
+        abi_data = json.loads(head + fh.read())
+    return abi_data.get("abi_version", {"major": abi.ABI_VERSION_MAJOR, "minor": 0})
 
 
 def _parse_semver(value: str) -> Optional[tuple[int, int, int]]:
@@ -689,6 +1039,7 @@ def _satisfies_version(actual: str, req: str) -> bool:
     return act == base
 
 
+@lru_cache(maxsize=1)
 def _find_cc() -> Optional[str]:
     for name in ("clang", "gcc", "cl"):
         if _which(name):
@@ -698,6 +1049,7 @@ def _find_cc() -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=1)
 def _find_vcvarsall() -> Optional[str]:
     if os.name != "nt":
         return None
@@ -719,6 +1071,7 @@ def _find_vcvarsall() -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=1)
 def _find_vswhere() -> Optional[str]:
     pf86 = os.environ.get("ProgramFiles(x86)", "")
     candidate = Path(pf86) / "Microsoft Visual Studio" / "Installer" / "vswhere.exe"
@@ -727,46 +1080,55 @@ def _find_vswhere() -> Optional[str]:
     return None
 
 
-def _emit_abi_manifest(ir_module: "ir.IRModule", build_dir: Path) -> None:
+def invalidate_compiler_cache() -> None:
+    # Compiler discovery is memoized per process; call this after changing PATH or installing a toolchain.
+    _find_cc.cache_clear()
+    _find_vcvarsall.cache_clear()
+    _find_vswhere.cache_clear()
+    _which.cache_clear()
+
+
+def _abi_entries(ir_module: "ir.IRModule") -> List[dict]:
     entries = []
     for func in ir_module.functions:
         if func.name == "main":
             continue
-        params = [p.type_name for p in func.params]
+        params = tuple(p.type_name for p in func.params)
         entries.append(
             {
                 "name": func.name,
                 "symbol": abi.mangle(ir_module.name, func.name),
-                "params": params,
+                "params": list(params),
                 "return": func.return_type,
                 "sig": abi.signature_hash(params, func.return_type),
             }
         )
     for ext in ir_module.externs:
-        params = [p.type_name for p in ext.params]
+        params = tuple(p.type_name for p in ext.params)
         entries.append(
             {
                 "name": ext.name,
                 "symbol": ext.name,
-                "params": params,
+                "params": list(params),
                 "return": ext.return_type,
                 "sig": abi.signature_hash(params, ext.return_type),
                 "extern": True,
             }
         )
+    return entries
+
+
+def _emit_abi_manifest(ir_module: "ir.IRModule", build_dir: Path, entries: List[dict]) -> None:
     manifest = {"module": ir_module.name, "abi_version": abi.version_dict(), "functions": entries}
-    (build_dir / f"{ir_module.name}.abi.json").write_text(
-        json.dumps(manifest, indent=2),
-        encoding="utf-8",
-    )
+    _write_if_changed(build_dir / f"{ir_module.name}.abi.json", json.dumps(manifest, indent=2).encode("utf-8"))
 
 
-def _check_abi_compat(ir_module: "ir.IRModule", build_dir: Path) -> None:
+def _check_abi_compat(ir_module: "ir.IRModule", build_dir: Path, current_funcs: List[dict]) -> None:
     manifest_path = build_dir / f"{ir_module.name}.abi.json"
-    if not manifest_path.exists():
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
         return
-    previous = json.loads(manifest_path.read_text(encoding="utf-8"))
-    prev_funcs = {f["name"]: f for f in previous.get("functions", [])}
     prev_version = previous.get("abi_version", {"major": abi.ABI_VERSION_MAJOR, "minor": 0})
     if isinstance(prev_version, int):
         prev_major = prev_version
@@ -781,41 +1143,21 @@ def _check_abi_compat(ir_module: "ir.IRModule", build_dir: Path) -> None:
             f"ABI minor regression: {prev_minor} -> {abi.ABI_VERSION_MINOR}. "
             "Increase minor or regenerate with migration."
         )
-    current_funcs = []
-    for func in ir_module.functions:
-        if func.name == "main":
-            continue
-        params = [p.type_name for p in func.params]
-        current_funcs.append(
-            {
-                "name": func.name,
-                "symbol": abi.mangle(ir_module.name, func.name),
-                "params": params,
-                "return": func.return_type,
-                "sig": abi.signature_hash(params, func.return_type),
-            }
-        )
-    for ext in ir_module.externs:
-        params = [p.type_name for p in ext.params]
-        current_funcs.append(
-            {
-                "name": ext.name,
-                "symbol": ext.name,
-                "params": params,
-                "return": ext.return_type,
-                "sig": abi.signature_hash(params, ext.return_type),
-                "extern": True,
-            }
-        )
+    # An unchanged function list can neither remove, change nor add anything.
+    if previous.get("functions") == current_funcs:
+        return
+    prev_funcs = {f["name"]: f for f in previous.get("functions", [])}
     errors = []
-    current_names = {f["name"] for f in current_funcs}
-    for name, prev in prev_funcs.items():
-        if name not in current_names:
-            errors.append(f"ABI removed function: {name}")
-    for func in current_funcs:
-        prev = prev_funcs.get(func["name"])
-        if prev and prev.get("sig") != func["sig"]:
-            errors.append(f"ABI mismatch for {func['name']}: {prev.get('sig')} -> {func['sig']}")
+    # With no previous functions nothing can be removed or changed, only added.
+    if prev_funcs:
+        current_names = {f["name"] for f in current_funcs}
+        for name, prev in prev_funcs.items():
+            if name not in current_names:
+                errors.append(f"ABI removed function: {name}")
+        for func in current_funcs:
+            prev = prev_funcs.get(func["name"])
+            if prev and prev.get("sig") != func["sig"]:
+                errors.append(f"ABI mismatch for {func['name']}: {prev.get('sig')} -> {func['sig']}")
     added = [f["name"] for f in current_funcs if f["name"] not in prev_funcs]
     if added and abi.ABI_VERSION_MINOR == prev_minor:
         errors.append("ABI additions require minor version bump: " + ", ".join(added))
@@ -837,11 +1179,8 @@ def _write_migration_log(build_dir: Path, module_name: str, errors: List[str], a
     (build_dir / f"{module_name}.abi.migration.log").write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 
+@lru_cache(maxsize=256)
 def _which(name: str) -> Optional[str]:
-    for path in os.environ.get("PATH", "").split(os.pathsep):
-        candidate = Path(path) / (name + ".exe" if os.name == "nt" else name)
-        if candidate.exists():
-            return str(candidate)
-    return None
+    return shutil.which(name)
 
 
@@ -15,8 +15,7 @@ def format_source(source: str) -> str:
 
 
 def _normalize_spacing(text: str) -> str:
-    text = " ".join(text.strip().split())
-    text = text.replace(" : ", ":")
-    return text
+    # split() already drops leading/trailing whitespace; it beats re.sub here.
+    return " ".join(text.split()).replace(" : ", ":")
 
 
@@ -17,63 +17,68 @@ def validate_module(module: ir.IRModule) -> None:
 def _validate_function(func: ir.IRFunction) -> List[str]:
     defined = {param.name for param in func.params}
     errors: List[str] = []
+    uses = _uses
+    is_literal = _is_literal
     for block in func.blocks:
         for instr in block.instructions:
-            for arg in _uses(instr):
-                if _is_literal(arg):
-                    continue
-                if arg not in defined:
-                    errors.append(f"{func.name}: use before def `{arg}` in {instr.op}")
-            if instr.result:
-                defined.add(instr.result)
+            if instr.op not in _NO_USES:
+                # Most operands are already defined; only the rest can be literals.
+                for arg in uses(instr):
+                    if arg not in defined and not is_literal(arg):
+                        errors.append(f"{func.name}: use before def `{arg}` in {instr.op}")
+            result = instr.result
+            if result:
+                defined.add(result)
     return errors
 
 
+# Ops that read no operands, and the operand slice every other op reads;
+# ops missing from _USE_SLICES read all of their args.
+_NO_USES = frozenset({"const", "const_str", "if_else", "if_end", "while_end", "loop_end", "break", "continue"})
+_USE_SLICES = {
+    "assign": slice(0, 1),
+    "add": slice(0, 2),
+    "sub": slice(0, 2),
+    "mul": slice(0, 2),
+    "div": slice(0, 2),
+    "neg": slice(0, 1),
+    "print": slice(0, 1),
+    "ret": slice(0, 1),
+    "call": slice(1, None),
+    "struct_new": slice(1, None),
+    "struct_get": slice(0, 1),
+    "enum_make": slice(2, None),
+    "enum_tag": slice(0, 1),
+    "enum_payload": slice(0, 1),
+    "buf_create": slice(0, 1),
+    "buf_borrow": slice(0, 3),
+    "borrow": slice(0, 2),
+    "if_begin": slice(0, 1),
+    "while_begin": slice(0, 1),
+    "loop_begin": slice(0, 2),
+    "inc": slice(0, 1),
+}
+
+
 def _uses(instr: ir.Instr) -> Iterable[str]:
     op = instr.op
+    if op in _NO_USES:
+        return ()
     args = instr.args
-    if op in ("const", "const_str", "if_else", "if_end", "while_end", "loop_end", "break", "continue"):
-        return []
-    if op == "assign":
-        return args[:1]
-    if op in ("add", "sub", "mul", "div"):
-        return args[:2]
-    if op == "neg":
-        return args[:1]
-    if op == "print":
-        return args[:1]
-    if op == "ret":
-        return args[:1]
-    if op == "call":
-        return args[1:]
-    if op == "struct_new":
-        return args[1:]
-    if op == "struct_get":
-        return args[:1]
     if op == "struct_set":
-        return [args[0], args[2]]
-    if op == "enum_make":
-        return args[2:]
-    if op in ("enum_tag", "enum_payload"):
-        return args[:1]
-    if op == "buf_create":
-        return args[:1]
-    if op == "buf_borrow":
-        return args[:3]
-    if op == "borrow":
-        return args[:2]
-    if op in ("if_begin", "while_begin"):
-        return args[:1]
-    if op == "loop_begin":
-        return args[:2]
-    if op == "inc":
-        return args[:1]
-    return args
+        return (args[0], args[2])
+    use = _USE_SLICES.get(op)
+    return args if use is None else args[use]
 
 
 def _is_literal(value: str) -> bool:
-    if value in ("0", "1"):
+    digits = value[1:] if value[:1] in ("+", "-") else value
+    if digits.isdecimal():
         return True
+    # Names never start with a digit or a space; only such values can still
+    # be literals int() accepts, like "1_000" or " 7".
+    if not digits or not (digits[0].isdecimal() or digits[0].isspace()):
+        return False
     try:
         int(value)
         return True
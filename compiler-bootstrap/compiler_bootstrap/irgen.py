@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import sys
+from typing import Callable, Dict, List
 
 from compiler_core import ast, ir
 
+_BINOP_OPS = {"+": "add", "-": "sub", "*": "mul", "/": "div"}
+# Enum base name -> (success case, early-return case) for the `?` operator.
+_TRY_CASES = {"Result": ("Ok", "Err"), "Option": ("Some", "None")}
+
+# Temp names are numbered per module, so nearly all of them come from this
+# table instead of being formatted one by one.
+_TEMP_NAME_COUNT = 4096
+_TEMP_NAMES = tuple(sys.intern(f"t_{i}") for i in range(_TEMP_NAME_COUNT))
+
 
 class IRGen:
     def __init__(
@@ -19,6 +29,7 @@ class IRGen:
         self._struct_defs_extra = struct_defs or {}
         self._enum_defs_extra = enum_defs or {}
         self.expr_types = expr_types or {}
+        self._try_enum_cache: Dict[str, tuple[str, int] | None] = {}
 
     def lower_module(self, module: ast.Module) -> ir.IRModule:
         functions: List[ir.IRFunction] = []
@@ -28,6 +39,7 @@ class IRGen:
         self.struct_defs = {}
         self.enum_defs = {}
         self.struct_names = set()
+        self._try_enum_cache = {}
         for name, fields in self._struct_defs_extra.items():
             ir_fields = [ir.IRStructField(name=f_name, type_name=f_type.name) for f_name, f_type in fields]
             structs.append(ir.IRStruct(name=name, fields=ir_fields))
@@ -82,120 +94,131 @@ class IRGen:
         return ir.IRFunction(name=func.name, params=params, return_type=func.return_type.name, blocks=blocks)
 
     def _lower_stmt(self, stmt: ast.Stmt, block: ir.BasicBlock) -> None:
-        if isinstance(stmt, ast.Assign):
-            value = self._lower_expr(stmt.value, block)
-            if isinstance(stmt.target, ast.Name):
-                if stmt.target.value != "_":
-                    block.instructions.append(ir.Instr(op="assign", args=[value], result=stmt.target.value))
-            elif isinstance(stmt.target, ast.MemberAccess):
-                base = self._lower_expr(stmt.target.value, block)
-                block.instructions.append(ir.Instr(op="struct_set", args=[base, stmt.target.name, value]))
-        elif isinstance(stmt, ast.AddAssign):
-            target = self._lower_expr(stmt.target, block)
-            value = self._lower_expr(stmt.value, block)
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="add", args=[target, value], result=temp, type_name="int"))
-            if isinstance(stmt.target, ast.Name):
-                block.instructions.append(ir.Instr(op="assign", args=[temp], result=stmt.target.value))
-        elif isinstance(stmt, ast.Print):
+        lower = self._STMT_LOWERERS.get(type(stmt))
+        if lower is not None:
+            lower(self, stmt, block)
+
+    def _lower_assign(self, stmt: ast.Assign, block: ir.BasicBlock) -> None:
+        value = self._lower_expr(stmt.value, block)
+        if isinstance(stmt.target, ast.Name):
+            if stmt.target.value != "_":
+                block.instructions.append(ir.Instr(op="assign", args=[value], result=stmt.target.value))
+        elif isinstance(stmt.target, ast.MemberAccess):
+            base = self._lower_expr(stmt.target.value, block)
+            block.instructions.append(ir.Instr(op="struct_set", args=[base, stmt.target.name, value]))
+
+    def _lower_add_assign(self, stmt: ast.AddAssign, block: ir.BasicBlock) -> None:
+        target = self._lower_expr(stmt.target, block)
+        value = self._lower_expr(stmt.value, block)
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="add", args=[target, value], result=temp, type_name="int"))
+        if isinstance(stmt.target, ast.Name):
+            block.instructions.append(ir.Instr(op="assign", args=[temp], result=stmt.target.value))
+
+    def _lower_print(self, stmt: ast.Print, block: ir.BasicBlock) -> None:
+        value = self._lower_expr(stmt.value, block)
+        block.instructions.append(ir.Instr(op="print", args=[value]))
+
+    def _lower_return(self, stmt: ast.Return, block: ir.BasicBlock) -> None:
+        if stmt.value:
             value = self._lower_expr(stmt.value, block)
-            block.instructions.append(ir.Instr(op="print", args=[value]))
-        elif isinstance(stmt, ast.Return):
-            if stmt.value:
-                value = self._lower_expr(stmt.value, block)
-                block.instructions.append(ir.Instr(op="ret", args=[value]))
-            else:
-                block.instructions.append(ir.Instr(op="ret", args=["0"]))
-        elif isinstance(stmt, ast.BufferCreate):
-            size = self._lower_expr(stmt.size, block)
-            block.instructions.append(ir.Instr(op="buf_create", args=[size], result=stmt.name, type_name="buffer"))
-        elif isinstance(stmt, ast.BorrowSlice):
-            buffer_name = self._lower_expr(stmt.buffer, block)
-            start = self._lower_expr(stmt.start, block)
-            end = self._lower_expr(stmt.end, block)
-            block.instructions.append(
-                ir.Instr(op="buf_borrow", args=[buffer_name, start, end, "1" if stmt.mutable else "0"], result=stmt.name, type_name="view")
+            block.instructions.append(ir.Instr(op="ret", args=[value]))
+        else:
+            block.instructions.append(ir.Instr(op="ret", args=["0"]))
+
+    def _lower_buffer_create(self, stmt: ast.BufferCreate, block: ir.BasicBlock) -> None:
+        size = self._lower_expr(stmt.size, block)
+        block.instructions.append(ir.Instr(op="buf_create", args=[size], result=stmt.name, type_name="buffer"))
+
+    def _lower_borrow_slice(self, stmt: ast.BorrowSlice, block: ir.BasicBlock) -> None:
+        buffer_name = self._lower_expr(stmt.buffer, block)
+        start = self._lower_expr(stmt.start, block)
+        end = self._lower_expr(stmt.end, block)
+        block.instructions.append(
+            ir.Instr(op="buf_borrow", args=[buffer_name, start, end, "1" if stmt.mutable else "0"], result=stmt.name, type_name="view")
+        )
+
+    def _lower_if(self, stmt: ast.If, block: ir.BasicBlock) -> None:
+        cond = self._lower_expr(stmt.condition, block)
+        instrs = block.instructions
+        # Nested bodies lower straight into the enclosing block, between
+        # their structure markers.
+        instrs.append(ir.Instr(op="if_begin", args=[cond]))
+        for inner in stmt.body:
+            self._lower_stmt(inner, block)
+        if stmt.else_body:
+            instrs.append(ir.Instr(op="if_else"))
+            for inner in stmt.else_body:
+                self._lower_stmt(inner, block)
+        instrs.append(ir.Instr(op="if_end"))
+
+    def _lower_repeat(self, stmt: ast.Repeat, block: ir.BasicBlock) -> None:
+        count = self._lower_expr(stmt.count, block)
+        loop_var = self._temp()
+        instrs = block.instructions
+        instrs.extend(
+            (
+                ir.Instr(op="const", args=["0"], result=loop_var, type_name="int"),
+                ir.Instr(op="loop_begin", args=[loop_var, count]),
             )
-        elif isinstance(stmt, ast.If):
-            cond = self._lower_expr(stmt.condition, block)
-            block.instructions.append(ir.Instr(op="if_begin", args=[cond]))
-            then_block = ir.BasicBlock(label=f"if_{self._temp()}", instructions=[])
-            for inner in stmt.body:
-                self._lower_stmt(inner, then_block)
-            block.instructions.extend(then_block.instructions)
-            if stmt.else_body:
-                block.instructions.append(ir.Instr(op="if_else"))
-                else_block = ir.BasicBlock(label=f"else_{self._temp()}", instructions=[])
-                for inner in stmt.else_body:
-                    self._lower_stmt(inner, else_block)
-                block.instructions.extend(else_block.instructions)
-            block.instructions.append(ir.Instr(op="if_end"))
-        elif isinstance(stmt, ast.Repeat):
-            count = self._lower_expr(stmt.count, block)
-            loop_var = self._temp()
-            block.instructions.append(ir.Instr(op="const", args=["0"], result=loop_var, type_name="int"))
-            block.instructions.append(ir.Instr(op="loop_begin", args=[loop_var, count]))
-            loop_block = ir.BasicBlock(label=f"loop_{self._temp()}", instructions=[])
-            for inner in stmt.body:
-                self._lower_stmt(inner, loop_block)
-            loop_block.instructions.append(ir.Instr(op="inc", args=[loop_var]))
-            block.instructions.extend(loop_block.instructions)
-            block.instructions.append(ir.Instr(op="loop_end"))
-        elif isinstance(stmt, ast.While):
-            cond_var = self._lower_expr(stmt.condition, block)
-            block.instructions.append(ir.Instr(op="while_begin", args=[cond_var]))
-            loop_block = ir.BasicBlock(label=f"while_{self._temp()}", instructions=[])
-            for inner in stmt.body:
-                self._lower_stmt(inner, loop_block)
-            next_cond = self._lower_expr(stmt.condition, loop_block)
-            loop_block.instructions.append(ir.Instr(op="assign", args=[next_cond], result=cond_var))
-            block.instructions.extend(loop_block.instructions)
-            block.instructions.append(ir.Instr(op="while_end"))
-        elif isinstance(stmt, ast.Match):
-            match_val = self._lower_expr(stmt.value, block)
-            enum_name = self._match_enum_name(stmt)
-            match_tag = None
-            if enum_name:
-                match_tag = self._temp()
-                block.instructions.append(ir.Instr(op="enum_tag", args=[match_val], result=match_tag))
-            matched = self._temp()
-            block.instructions.append(ir.Instr(op="const", args=["0"], result=matched, type_name="int"))
-            for case in stmt.cases:
-                matched_cond = self._temp()
-                block.instructions.append(ir.Instr(op="call", args=["eq", matched, "0"], result=matched_cond))
-                block.instructions.append(ir.Instr(op="if_begin", args=[matched_cond]))
-                case_block = ir.BasicBlock(label=f"match_{self._temp()}", instructions=[])
-                self._lower_match_case(case, match_val, enum_name, match_tag, matched, case_block)
-                block.instructions.extend(case_block.instructions)
-                block.instructions.append(ir.Instr(op="if_end"))
-            if stmt.else_body:
-                cond = self._temp()
-                block.instructions.append(ir.Instr(op="call", args=["eq", matched, "0"], result=cond))
-                block.instructions.append(ir.Instr(op="if_begin", args=[cond]))
-                else_block = ir.BasicBlock(label=f"match_{self._temp()}", instructions=[])
-                for inner in stmt.else_body:
-                    self._lower_stmt(inner, else_block)
-                block.instructions.extend(else_block.instructions)
-                block.instructions.append(ir.Instr(op="if_end"))
-        elif isinstance(stmt, ast.UnsafeBlock):
-            for inner in stmt.body:
+        )
+        for inner in stmt.body:
+            self._lower_stmt(inner, block)
+        instrs.extend((ir.Instr(op="inc", args=[loop_var]), ir.Instr(op="loop_end")))
+
+    def _lower_while(self, stmt: ast.While, block: ir.BasicBlock) -> None:
+        cond_var = self._lower_expr(stmt.condition, block)
+        instrs = block.instructions
+        instrs.append(ir.Instr(op="while_begin", args=[cond_var]))
+        for inner in stmt.body:
+            self._lower_stmt(inner, block)
+        next_cond = self._lower_expr(stmt.condition, block)
+        instrs.extend((ir.Instr(op="assign", args=[next_cond], result=cond_var), ir.Instr(op="while_end")))
+
+    def _lower_match(self, stmt: ast.Match, block: ir.BasicBlock) -> None:
+        match_val = self._lower_expr(stmt.value, block)
+        enum_name = self._match_enum_name(stmt)
+        instrs = block.instructions
+        match_tag = None
+        if enum_name:
+            match_tag = self._temp()
+            instrs.append(ir.Instr(op="enum_tag", args=[match_val], result=match_tag))
+        matched = self._temp()
+        instrs.append(ir.Instr(op="const", args=["0"], result=matched, type_name="int"))
+        for case in stmt.cases:
+            matched_cond = self._temp()
+            instrs.extend(
+                (
+                    ir.Instr(op="call", args=["eq", matched, "0"], result=matched_cond),
+                    ir.Instr(op="if_begin", args=[matched_cond]),
+                )
+            )
+            self._lower_match_case(case, match_val, enum_name, match_tag, matched, block)
+            instrs.append(ir.Instr(op="if_end"))
+        if stmt.else_body:
+            cond = self._temp()
+            instrs.extend((ir.Instr(op="call", args=["eq", matched, "0"], result=cond), ir.Instr(op="if_begin", args=[cond])))
+            for inner in stmt.else_body:
                 self._lower_stmt(inner, block)
-        elif isinstance(stmt, ast.Move):
-            src = self._lower_expr(stmt.src, block)
-            block.instructions.append(ir.Instr(op="assign", args=[src], result=stmt.dst))
-        elif isinstance(stmt, ast.Release):
-            target = self._lower_expr(stmt.target, block)
-            block.instructions.append(ir.Instr(op="release", args=[target]))
-        elif isinstance(stmt, ast.Break):
-            block.instructions.append(ir.Instr(op="break"))
-        elif isinstance(stmt, ast.Continue):
-            block.instructions.append(ir.Instr(op="continue"))
-        elif isinstance(stmt, ast.Import):
-            return
-        elif isinstance(stmt, ast.StructDef):
-            return
-        elif isinstance(stmt, ast.EnumDef):
-            return
+            instrs.append(ir.Instr(op="if_end"))
+
+    def _lower_unsafe(self, stmt: ast.UnsafeBlock, block: ir.BasicBlock) -> None:
+        for inner in stmt.body:
+            self._lower_stmt(inner, block)
+
+    def _lower_move(self, stmt: ast.Move, block: ir.BasicBlock) -> None:
+        src = self._lower_expr(stmt.src, block)
+        block.instructions.append(ir.Instr(op="assign", args=[src], result=stmt.dst))
+
+    def _lower_release(self, stmt: ast.Release, block: ir.BasicBlock) -> None:
+        target = self._lower_expr(stmt.target, block)
+        block.instructions.append(ir.Instr(op="release", args=[target]))
+
+    def _lower_break(self, stmt: ast.Break, block: ir.BasicBlock) -> None:
+        block.instructions.append(ir.Instr(op="break"))
+
+    def _lower_continue(self, stmt: ast.Continue, block: ir.BasicBlock) -> None:
+        block.instructions.append(ir.Instr(op="continue"))
 
     def _match_enum_name(self, stmt: ast.Match) -> str | None:
         enum_name = None
@@ -220,6 +243,19 @@ class IRGen:
                 return idx
         return -1
 
+    def _resolve_try_enum(self, type_name: str) -> tuple[str, int] | None:
+        base = type_name.split("__", 1)[0]
+        if base not in _TRY_CASES:
+            self._try_enum_cache[type_name] = None
+            return None
+        # Enums can still be declared later in the module, so misses are not cached.
+        if type_name not in self.enum_defs:
+            return None
+        ok_case, err_case = _TRY_CASES[base]
+        resolved = (ok_case, self._enum_case_index(type_name, err_case))
+        self._try_enum_cache[type_name] = resolved
+        return resolved
+
     def _emit_if(self, block: ir.BasicBlock, cond: str, emit_body) -> None:
         block.instructions.append(ir.Instr(op="if_begin", args=[cond]))
         emit_body()
@@ -339,110 +375,179 @@ class IRGen:
                 return
 
     def _lower_expr(self, expr: ast.Expr, block: ir.BasicBlock) -> str:
-        if isinstance(expr, ast.IntLit):
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="const", args=[str(expr.value)], result=temp, type_name="int"))
-            return temp
-        if isinstance(expr, ast.StringLit):
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="const_str", args=[expr.value], result=temp, type_name="string"))
-            return temp
-        if isinstance(expr, ast.BoolLit):
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="const", args=["1" if expr.value else "0"], result=temp, type_name="bool"))
-            return temp
-        if isinstance(expr, ast.Name):
-            return expr.value
-        if isinstance(expr, ast.Call):
-            args = [self._lower_expr(arg, block) for arg in expr.args]
-            temp = self._temp()
-            if expr.callee in self.struct_defs or expr.callee in self.struct_names:
-                block.instructions.append(ir.Instr(op="struct_new", args=[expr.callee] + args, result=temp, type_name=expr.callee))
-                return temp
-            if "." in expr.callee:
-                enum_name, case_name = expr.callee.split(".", 1)
-                if enum_name in self.enum_defs:
-                    block.instructions.append(ir.Instr(op="enum_make", args=[enum_name, case_name] + args, result=temp, type_name=enum_name))
-                    return temp
-            block.instructions.append(ir.Instr(op="call", args=[expr.callee] + args, result=temp))
-            return temp
-        if isinstance(expr, ast.MemberAccess):
-            base = self._lower_expr(expr.value, block)
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="struct_get", args=[base, expr.name], result=temp))
-            return temp
-        if isinstance(expr, ast.BinOp):
-            left = self._lower_expr(expr.left, block)
-            right = self._lower_expr(expr.right, block)
-            temp = self._temp()
-            op_map = {"+": "add", "-": "sub", "*": "mul", "/": "div"}
-            op = op_map.get(expr.op)
-            if op is None:
-                block.instructions.append(ir.Instr(op="const", args=["0"], result=temp, type_name="int"))
-                return temp
-            block.instructions.append(ir.Instr(op=op, args=[left, right], result=temp, type_name="int"))
-            return temp
-        if isinstance(expr, ast.UnaryOp):
-            value = self._lower_expr(expr.value, block)
-            if expr.op == "+":
-                return value
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="neg", args=[value], result=temp, type_name="int"))
+        lower = self._EXPR_LOWERERS.get(type(expr))
+        if lower is not None:
+            return lower(self, expr, block)
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="const", args=["0"], result=temp, type_name="int"))
+        return temp
+
+    def _lower_int_lit(self, expr: ast.IntLit, block: ir.BasicBlock) -> str:
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="const", args=[str(expr.value)], result=temp, type_name="int"))
+        return temp
+
+    def _lower_string_lit(self, expr: ast.StringLit, block: ir.BasicBlock) -> str:
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="const_str", args=[expr.value], result=temp, type_name="string"))
+        return temp
+
+    def _lower_bool_lit(self, expr: ast.BoolLit, block: ir.BasicBlock) -> str:
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="const", args=["1" if expr.value else "0"], result=temp, type_name="bool"))
+        return temp
+
+    def _lower_name(self, expr: ast.Name, block: ir.BasicBlock) -> str:
+        return expr.value
+
+    def _lower_call(self, expr: ast.Call, block: ir.BasicBlock) -> str:
+        callee = expr.callee
+        op = "call"
+        type_name = None
+        args = [callee]
+        if callee in self.struct_defs or callee in self.struct_names:
+            op = "struct_new"
+            type_name = callee
+        elif "." in callee:
+            enum_name, case_name = callee.split(".", 1)
+            if enum_name in self.enum_defs:
+                op = "enum_make"
+                type_name = enum_name
+                args = [enum_name, case_name]
+        # Lowered operands go straight into the instruction's argument list.
+        lower = self._lower_expr
+        for arg in expr.args:
+            args.append(lower(arg, block))
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op=op, args=args, result=temp, type_name=type_name))
+        return temp
+
+    def _lower_member_access(self, expr: ast.MemberAccess, block: ir.BasicBlock) -> str:
+        base = self._lower_expr(expr.value, block)
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="struct_get", args=[base, expr.name], result=temp))
+        return temp
+
+    def _lower_binop(self, expr: ast.BinOp, block: ir.BasicBlock) -> str:
+        left = self._lower_expr(expr.left, block)
+        right = self._lower_expr(expr.right, block)
+        temp = self._temp()
+        op = _BINOP_OPS.get(expr.op)
+        if op is None:
+            block.instructions.append(ir.Instr(op="const", args=["0"], result=temp, type_name="int"))
             return temp
-        if isinstance(expr, ast.LogicalOp):
-            left = self._lower_expr(expr.left, block)
-            result = self._temp()
-            if expr.op == "and":
-                block.instructions.append(ir.Instr(op="const", args=["0"], result=result, type_name="bool"))
-                block.instructions.append(ir.Instr(op="if_begin", args=[left]))
-                right = self._lower_expr(expr.right, block)
-                block.instructions.append(ir.Instr(op="assign", args=[right], result=result))
-                block.instructions.append(ir.Instr(op="if_end"))
-                return result
-            block.instructions.append(ir.Instr(op="assign", args=[left], result=result))
+        block.instructions.append(ir.Instr(op=op, args=[left, right], result=temp, type_name="int"))
+        return temp
+
+    def _lower_unary_op(self, expr: ast.UnaryOp, block: ir.BasicBlock) -> str:
+        value = self._lower_expr(expr.value, block)
+        if expr.op == "+":
+            return value
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="neg", args=[value], result=temp, type_name="int"))
+        return temp
+
+    def _lower_logical_op(self, expr: ast.LogicalOp, block: ir.BasicBlock) -> str:
+        left = self._lower_expr(expr.left, block)
+        instrs = block.instructions
+        result = self._temp()
+        if expr.op == "and":
+            instrs.extend(
+                (
+                    ir.Instr(op="const", args=["0"], result=result, type_name="bool"),
+                    ir.Instr(op="if_begin", args=[left]),
+                )
+            )
+        else:
             cond = self._temp()
-            block.instructions.append(ir.Instr(op="call", args=["eq", left, "0"], result=cond))
-            block.instructions.append(ir.Instr(op="if_begin", args=[cond]))
-            right = self._lower_expr(expr.right, block)
-            block.instructions.append(ir.Instr(op="assign", args=[right], result=result))
-            block.instructions.append(ir.Instr(op="if_end"))
-            return result
-        if isinstance(expr, ast.TryExpr):
-            value = self._lower_expr(expr.value, block)
-            type_info = self.expr_types.get(id(expr.value))
-            type_name = type_info.name if type_info else ""
-            base = type_name.split("__", 1)[0] if type_name else ""
-            if base in ("Result", "Option") and type_name in self.enum_defs:
-                err_case = "Err" if base == "Result" else "None"
-                ok_case = "Ok" if base == "Result" else "Some"
-                tag = self._temp()
-                block.instructions.append(ir.Instr(op="enum_tag", args=[value], result=tag))
-                err_index = self._enum_case_index(type_name, err_case)
-                cond = self._temp()
-                block.instructions.append(ir.Instr(op="call", args=["eq", tag, str(err_index)], result=cond))
-                block.instructions.append(ir.Instr(op="if_begin", args=[cond]))
-                block.instructions.append(ir.Instr(op="ret", args=[value]))
-                block.instructions.append(ir.Instr(op="if_end"))
-                ok_val = self._temp()
-                block.instructions.append(ir.Instr(op="enum_payload", args=[value, ok_case], result=ok_val))
-                return ok_val
+            instrs.extend(
+                (
+                    ir.Instr(op="assign", args=[left], result=result),
+                    ir.Instr(op="call", args=["eq", left, "0"], result=cond),
+                    ir.Instr(op="if_begin", args=[cond]),
+                )
+            )
+        right = self._lower_expr(expr.right, block)
+        instrs.extend((ir.Instr(op="assign", args=[right], result=result), ir.Instr(op="if_end")))
+        return result
+
+    def _lower_try(self, expr: ast.TryExpr, block: ir.BasicBlock) -> str:
+        value = self._lower_expr(expr.value, block)
+        type_info = self.expr_types.get(id(expr.value))
+        if not type_info:
             return value
-        if isinstance(expr, ast.BorrowExpr):
-            value = self._lower_expr(expr.value, block)
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="borrow", args=[value, "1" if expr.mutable else "0"], result=temp, type_name="view"))
-            return temp
-        if isinstance(expr, ast.CopyExpr):
-            value = self._lower_expr(expr.value, block)
-            temp = self._temp()
-            block.instructions.append(ir.Instr(op="assign", args=[value], result=temp))
-            return temp
+        type_name = type_info.name
+        try_enum = self._try_enum_cache.get(type_name, False)
+        if try_enum is False:
+            try_enum = self._resolve_try_enum(type_name)
+        if try_enum is not None:
+            ok_case, err_index = try_enum
+            tag = self._temp()
+            cond = self._temp()
+            ok_val = self._temp()
+            block.instructions.extend(
+                (
+                    ir.Instr(op="enum_tag", args=[value], result=tag),
+                    ir.Instr(op="call", args=["eq", tag, str(err_index)], result=cond),
+                    ir.Instr(op="if_begin", args=[cond]),
+                    ir.Instr(op="ret", args=[value]),
+                    ir.Instr(op="if_end"),
+                    ir.Instr(op="enum_payload", args=[value, ok_case], result=ok_val),
+                )
+            )
+            return ok_val
+        return value
+
+    def _lower_borrow(self, expr: ast.BorrowExpr, block: ir.BasicBlock) -> str:
+        value = self._lower_expr(expr.value, block)
         temp = self._temp()
-        block.instructions.append(ir.Instr(op="const", args=["0"], result=temp, type_name="int"))
+        block.instructions.append(ir.Instr(op="borrow", args=[value, "1" if expr.mutable else "0"], result=temp, type_name="view"))
+        return temp
+
+    def _lower_copy(self, expr: ast.CopyExpr, block: ir.BasicBlock) -> str:
+        value = self._lower_expr(expr.value, block)
+        temp = self._temp()
+        block.instructions.append(ir.Instr(op="assign", args=[value], result=temp))
         return temp
 
     def _temp(self) -> str:
         self.temp_index += 1
-        return f"t_{self.temp_index}"
+        index = self.temp_index
+        if index < _TEMP_NAME_COUNT:
+            return _TEMP_NAMES[index]
+        return f"t_{index}"
 
+    # Keyed on the exact node class; statements missing here (imports and
+    # nested type definitions) lower to nothing, expressions to `const 0`.
+    _STMT_LOWERERS: Dict[type, Callable[["IRGen", ast.Stmt, ir.BasicBlock], None]] = {
+        ast.Assign: _lower_assign,
+        ast.AddAssign: _lower_add_assign,
+        ast.Print: _lower_print,
+        ast.Return: _lower_return,
+        ast.BufferCreate: _lower_buffer_create,
+        ast.BorrowSlice: _lower_borrow_slice,
+        ast.If: _lower_if,
+        ast.Repeat: _lower_repeat,
+        ast.While: _lower_while,
+        ast.Match: _lower_match,
+        ast.UnsafeBlock: _lower_unsafe,
+        ast.Move: _lower_move,
+        ast.Release: _lower_release,
+        ast.Break: _lower_break,
+        ast.Continue: _lower_continue,
+    }
 
+    _EXPR_LOWERERS: Dict[type, Callable[["IRGen", ast.Expr, ir.BasicBlock], str]] = {
+        ast.IntLit: _lower_int_lit,
+        ast.StringLit: _lower_string_lit,
+        ast.BoolLit: _lower_bool_lit,
+        ast.Name: _lower_name,
+        ast.Call: _lower_call,
+        ast.MemberAccess: _lower_member_access,
+        ast.BinOp: _lower_binop,
+        ast.UnaryOp: _lower_unary_op,
+        ast.LogicalOp: _lower_logical_op,
+        ast.TryExpr: _lower_try,
+        ast.BorrowExpr: _lower_borrow,
+        ast.CopyExpr: _lower_copy,
+    }
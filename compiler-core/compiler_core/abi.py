@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import hashlib
-from typing import Iterable
+from functools import lru_cache
+from typing import Iterable, Tuple
 
 ABI_VERSION_MAJOR = 2
 ABI_VERSION_MINOR = 15
 
 
+@lru_cache(maxsize=4096)
 def mangle(module: str, name: str) -> str:
     safe_module = module.replace(".", "__")
     safe_name = name.replace(".", "__")
@@ -14,6 +16,11 @@ def mangle(module: str, name: str) -> str:
 
 
 def signature_hash(params: Iterable[str], return_type: str) -> str:
+    return _signature_hash(tuple(params), return_type)
+
+
+@lru_cache(maxsize=4096)
+def _signature_hash(params: Tuple[str, ...], return_type: str) -> str:
     payload = ",".join(params) + "->" + return_type
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
 
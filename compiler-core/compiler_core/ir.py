@@ -4,38 +4,38 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class IRExtern:
     name: str
     params: List["IRParam"]
     return_type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class IRStructField:
     name: str
     type_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class IRStruct:
     name: str
     fields: List[IRStructField]
 
 
-@dataclass
+@dataclass(slots=True)
 class IREnumCase:
     name: str
     payload: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IREnum:
     name: str
     cases: List[IREnumCase]
 
 
-@dataclass
+@dataclass(slots=True)
 class IRModule:
     name: str
     functions: List["IRFunction"]
@@ -44,7 +44,7 @@ class IRModule:
     enums: List[IREnum] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class IRFunction:
     name: str
     params: List["IRParam"]
@@ -52,19 +52,19 @@ class IRFunction:
     blocks: List["BasicBlock"]
 
 
-@dataclass
+@dataclass(slots=True)
 class IRParam:
     name: str
     type_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicBlock:
     label: str
     instructions: List["Instr"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Instr:
     op: str
     args: List[str] = field(default_factory=list)
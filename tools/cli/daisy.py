@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import subprocess
 import sys
+import traceback
 from pathlib import Path
+from typing import Optional, TextIO
 
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
@@ -18,7 +22,9 @@ from tools.bindgen.bindgen import run_bindgen  # noqa: E402
 from pkg.cargo_bridge.bridge import pkg_add  # noqa: E402
 
 
-def main() -> int:
+def main(argv: Optional[list[str]] = None) -> int:
+    if (sys.argv[1:] if argv is None else argv)[:1] == ["--server"]:
+        return _cmd_server()
     parser = argparse.ArgumentParser(prog="daisy")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -73,7 +79,7 @@ def main() -> int:
     bindgen.add_argument("mode")
     bindgen.add_argument("target")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.cmd == "init":
         return _cmd_init()
@@ -204,6 +210,50 @@ def _cmd_bench(as_json: bool, out: str | None, runs: int | None, warmup: int | N
     if warmup is not None:
         cmd += ["--warmup", str(warmup)]
     return subprocess.call(cmd)
+
+
+def _cmd_server() -> int:
+    # One JSON request per line on stdin: {"argv": [...]} runs a subcommand, {"ping": true} checks liveness.
+    # Each request is answered with a single {"code": N} line. Replies get a private copy of stdout and
+    # fd 1 is pointed at stderr, so output from commands and their child processes cannot corrupt the protocol.
+    sys.stdout.flush()
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            _server_reply(replies, 2)
+            continue
+        if not isinstance(request, dict):
+            _server_reply(replies, 2)
+            continue
+        if request.get("ping"):
+            _server_reply(replies, 0)
+            continue
+        argv = request.get("argv")
+        if not isinstance(argv, list) or argv[:1] == ["--server"]:
+            _server_reply(replies, 2)
+            continue
+        try:
+            code = main([str(arg) for arg in argv])
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        sys.stdout.flush()
+        _server_reply(replies, code)
+    return 0
+
+
+def _server_reply(replies: TextIO, code: int) -> None:
+    replies.write(json.dumps({"code": code}) + "\n")
+    replies.flush()
+
+
 def _cmd_lsp() -> int:
     return subprocess.call([sys.executable, str(ROOT / "tools" / "lsp" / "server.py")])
 